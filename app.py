@@ -28,6 +28,11 @@ except Exception as e:
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your_secret_key_change_in_production')
 
+# Only the web app runs the scheduler; importing the tracker elsewhere (batch
+# CLI, benchmarks) must not attach to the job store or replay missed runs
+from product_tracker.scheduler import start_scheduler
+start_scheduler()
+
 # Initialize Keep-Alive Service for Render
 try:
     from product_tracker.keep_alive import keep_alive_service
@@ -100,7 +105,7 @@ def form_page():
 
 from product_tracker.tracker import scheduled_products
 
-from product_tracker.scheduler import save_scheduled, delete_scheduled
+from product_tracker.scheduler import save_scheduled, delete_scheduled, reconcile_jobs, get_spread_offset
 @app.route('/tracking', methods=['GET', 'POST'])
 def tracking_table():
     edit_idx = None
@@ -136,13 +141,15 @@ def tracking_table():
                 item.pop('night_mode', None)
                 item.pop('night_end', None)
             save_scheduled(scheduled_products)
+            reconcile_jobs()
         elif 'delete_idx' in request.form:
             idx = int(request.form['delete_idx'])
             delete_scheduled(idx)
         elif 'cancel_edit' in request.form:
             pass  # Just reload, no edit_idx
     import product_tracker.config as config
-    return render_template('tracking.html', scheduled_products=scheduled_products, active_page='table', edit_idx=edit_idx, config=config)
+    spread_offsets = [get_spread_offset(item) for item in scheduled_products]
+    return render_template('tracking.html', scheduled_products=scheduled_products, spread_offsets=spread_offsets, active_page='table', edit_idx=edit_idx, config=config)
 
 @app.route('/chat', methods=['GET', 'POST'])
 def chat_management():
@@ -271,6 +278,7 @@ def debug_dashboard():
     """Main debug dashboard showing all products and debug links"""
     from datetime import datetime
     from product_tracker.database import get_database_status
+    from product_tracker.ratelimit import get_domain_guard_status
     
     # Get database status
     db_status = get_database_status()
@@ -286,6 +294,7 @@ def debug_dashboard():
                          total_chat_ids=len(all_chat_ids),
                          current_time=datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S %Z'),
                          db_status=db_status,
+                         domain_guards=get_domain_guard_status(),
                          active_page='debug')
 
 @app.route('/debug/database')
@@ -303,6 +312,54 @@ def debug_database():
     <a href="/debug">← Back to Debug Dashboard</a>
     """
 
+@app.route('/debug/scraping')
+def debug_scraping():
+    """Debug endpoint to check scraping infrastructure status"""
+    from product_tracker.browser_pool import get_browser_pool_status
+    from product_tracker.readiness import get_readiness_stats
+    from product_tracker.sites import get_registered_sites
+    from product_tracker.http_client import get_http_client_status
+    from product_tracker.response_cache import get_response_cache_status
+    from product_tracker.singleflight import get_single_flight_status
+    from product_tracker.identity import get_product_index_status
+    from product_tracker.structured import get_price_tier_stats
+    from product_tracker.escalation import get_escalation_stats, get_coupon_check_stats
+    from product_tracker.render_worker import get_render_worker_status
+    from product_tracker.selector_stats import get_selector_stats
+    from product_tracker.profiles import get_profile_status
+    from product_tracker.ratelimit import get_domain_guard_status
+    from product_tracker.compare import get_compare_status
+    from product_tracker.parsing import get_parse_stats
+    from product_tracker.admission import get_admission_status
+    import json
+
+    status = {
+        'sites': get_registered_sites(),
+        'http_sessions': get_http_client_status(),
+        'response_cache': get_response_cache_status(),
+        'single_flight': get_single_flight_status(),
+        'product_index': get_product_index_status(scheduled_products),
+        'generic_price_tiers': get_price_tier_stats(),
+        'fetch_tiers': get_escalation_stats(),
+        'coupon_checks': get_coupon_check_stats(),
+        'render_worker': get_render_worker_status(),
+        'selector_hits': get_selector_stats(),
+        'profiles': get_profile_status(),
+        'domain_guards': get_domain_guard_status(),
+        'alternate_sites': get_compare_status(),
+        'page_parsing': get_parse_stats(),
+        'admission': get_admission_status(),
+        'browser_pool': get_browser_pool_status(),
+        'page_ready_time': get_readiness_stats(),
+    }
+
+    return f"""
+    <h2>🕷️ Scraping Status</h2>
+    <pre>{json.dumps(status, indent=2)}</pre>
+    <br>
+    <a href="/debug">← Back to Debug Dashboard</a>
+    """
+
 @app.route('/debug/keep-alive')
 def debug_keep_alive():
     """Debug endpoint to check keep-alive service status"""
@@ -374,6 +431,71 @@ def debug_keep_alive():
     
     return html
 
+def _admission_summary_html():
+    """Fetch slot usage, queueing and job deadlines for the scheduler debug page"""
+    from product_tracker.admission import get_admission_status
+    admission = get_admission_status()
+    rows = ''.join(
+        f"<tr><td>{kind}</td><td>{s['in_flight']}/{s['limit']}</td><td>{s['queued']} (max {s['max_queued']})</td>"
+        f"<td>{s['admitted']}</td><td>{s['waited']}</td><td>{s['mean_wait_ms']}</td><td>{s['max_wait_ms']}</td><td>{s['timed_out']}</td></tr>"
+        for kind, s in admission['slots'].items()
+    )
+    deadlines = admission['deadlines']
+    return f"""
+        <h2>🚦 Fetch Admission</h2>
+        <table border="1" cellpadding="5" cellspacing="0">
+            <tr><th>Kind</th><th>Running</th><th>Queued</th><th>Admitted</th><th>Had to wait</th><th>Mean wait (ms)</th><th>Max wait (ms)</th><th>Timed out</th></tr>
+            {rows}
+        </table>
+        <p><strong>Job deadline:</strong> {deadlines['deadline_s']}s | <strong>Exceeded:</strong> {deadlines['exceeded']} of {deadlines['runs']} |
+           <strong>Browsers killed at deadline:</strong> {deadlines['drivers_killed']}</p>
+    """
+
+def _startup_summary_html(startup):
+    """Job store, restored jobs and missed-run catch-up for the scheduler debug page"""
+    if not startup:
+        return ''
+    return (
+        f"<p><strong>Job store:</strong> {startup['job_store']} | <strong>Startup:</strong> {startup['startup_ms']} ms | "
+        f"<strong>Restored jobs:</strong> {startup['restored_jobs']} | <strong>Missed runs:</strong> {startup['missed']} "
+        f"(made up: {startup['caught_up']}, pending: {startup['pending']}, dropped: {startup['dropped']})</p>"
+    )
+
+def _tick_summary_html(tick):
+    """Tick scheduler counters for the scheduler debug page"""
+    if not tick:
+        return ''
+    last = tick['last_tick']
+    last_html = (
+        f"window {last['window']}: {last['due']} due, {last['distinct_products']} products on "
+        f"{last['domains']} domains, {last['elapsed_s']}s"
+    ) if last else 'none yet'
+    return (
+        f"<p><strong>Tick:</strong> every {tick['tick_minutes']} min | <strong>Ticks:</strong> {tick['ticks']} | "
+        f"<strong>Product runs:</strong> {tick['product_runs']} | <strong>Last tick:</strong> {last_html}</p>"
+    )
+
+def _adaptive_summary_html(adaptive):
+    """Adaptive polling plan and checks saved for the scheduler debug page"""
+    if not adaptive or 'fixed_checks_per_day' not in adaptive:
+        return ''
+    rows = ''.join(
+        f"<tr><td>{pid}</td><td>{plan['base_hours']}</td><td>{plan['hours']}</td>"
+        f"<td>{plan['checks_per_day']}</td><td>{', '.join(plan['reasons'])}</td></tr>"
+        for pid, plan in adaptive['intervals'].items()
+    )
+    return f"""
+        <h2>📉 Adaptive Polling</h2>
+        <p><strong>Checks/day:</strong> {adaptive['adaptive_checks_per_day']} (fixed intervals: {adaptive['fixed_checks_per_day']},
+           saved: {adaptive['checks_saved_per_day']}) | <strong>Budget:</strong> {adaptive['budget_per_day'] or 'unlimited'}
+           {'<strong style="color: red;">(over budget)</strong>' if adaptive['over_budget'] else ''} |
+           <strong>Saved so far (est.):</strong> {adaptive['checks_saved_estimate']}</p>
+        <table border="1" cellpadding="5" cellspacing="0">
+            <tr><th>Product</th><th>Base (hrs)</th><th>Adaptive (hrs)</th><th>Checks/day</th><th>Why</th></tr>
+            {rows}
+        </table>
+    """
+
 @app.route('/debug/scheduler')
 def debug_scheduler():
     """Debug endpoint to check scheduler status"""
@@ -399,7 +521,10 @@ def debug_scheduler():
         <h1>🔍 Scheduler Debug Information</h1>
         
         <h2>Status: {status['status']}</h2>
-        <p><strong>Total Jobs:</strong> {status['total_jobs']}</p>
+        <p><strong>Mode:</strong> {status.get('mode', 'jobs')} | <strong>Total Jobs:</strong> {status['total_jobs']}</p>
+        {_startup_summary_html(status.get('startup'))}
+        
+        {_tick_summary_html(status.get('tick'))}
         
         <h2>📋 Current Jobs</h2>
         <table border="1" cellpadding="5" cellspacing="0">
@@ -429,6 +554,55 @@ def debug_scheduler():
             </tr>
         """
     
+    html += """
+        </table>
+    """
+    html += _admission_summary_html()
+    html += """
+        <h2>📈 Projected Load (runs per minute)</h2>
+    """
+    
+    load = status.get('load')
+    if load:
+        height = 120
+        scale = height / max(load['peak_per_minute'], 1)
+        points = ' '.join(f"{m / 2:.1f},{height - n * scale:.1f}" for m, n in enumerate(load['load']))
+        hour_marks = ''.join(
+            f'<line x1="{h * 30}" y1="0" x2="{h * 30}" y2="{height}" stroke="#eee"/>'
+            f'<text x="{h * 30 + 2}" y="{height + 12}" font-size="9">{h:02d}</text>'
+            for h in range(0, 24, 2)
+        )
+        html += f"""
+        <p><strong>Spread window:</strong> {load['spread_minutes']} min |
+           <strong>Runs/day:</strong> {load['runs_per_day']} |
+           <strong>Busy minutes:</strong> {load['busy_minutes']} |
+           <strong>Peak:</strong> {load['peak_per_minute']}/min at {', '.join(load['peak_at']) or '-'} |
+           <strong>Peak without spreading:</strong> {load['unlevelled_peak_per_minute']}/min</p>
+        <svg width="730" height="{height + 16}" style="border: 1px solid #ccc; background: #fff;">
+            {hour_marks}
+            <polyline points="{points}" fill="none" stroke="#007bff" stroke-width="1"/>
+        </svg>
+        """
+    
+    html += _adaptive_summary_html(status.get('adaptive'))
+    html += """
+        <h2>⏱️ Job Reconcile Latency</h2>
+        <table border="1" cellpadding="5" cellspacing="0">
+            <tr><th>Operation</th><th>Count</th><th>Mean (ms)</th><th>Max (ms)</th></tr>
+    """
+    
+    for op, stats in status.get('reconcile', {}).get('operations', {}).items():
+        html += f"<tr><td>{op}</td><td>{stats['count']}</td><td>{stats['mean_ms']}</td><td>{stats['max_ms']}</td></tr>"
+    
+    html += """
+        </table>
+        <table border="1" cellpadding="5" cellspacing="0" style="margin-top: 10px;">
+            <tr><th>At</th><th>Jobs</th><th>Added</th><th>Updated</th><th>Removed</th><th>Total (ms)</th></tr>
+    """
+    
+    for run in reversed(status.get('reconcile', {}).get('recent_reconciles', [])):
+        html += f"<tr><td>{run['at']}</td><td>{run['jobs']}</td><td>{run['added']}</td><td>{run['updated']}</td><td>{run['removed']}</td><td>{run['ms']}</td></tr>"
+    
     html += """
         </table>
         
@@ -502,17 +676,16 @@ def debug_trigger_product(product_id):
 @app.route('/debug/scheduler/trigger-all')
 def debug_trigger_all():
     """Trigger all scheduled jobs immediately for testing"""
-    from product_tracker.scheduler import trigger_job_now
+    from product_tracker.scheduler import trigger_all_jobs_now
     
     results = []
     success_count = 0
-    for i in range(len(scheduled_products)):
-        try:
-            result = trigger_job_now(i)
+    for i, ok, result in trigger_all_jobs_now():
+        if ok:
             results.append(f"Product {i}: ✅ {result}")
             success_count += 1
-        except Exception as e:
-            results.append(f"Product {i}: ❌ ERROR - {str(e)}")
+        else:
+            results.append(f"Product {i}: ❌ ERROR - {result}")
     
     html = f"""
     <html>
@@ -0,0 +1,251 @@
+"""
+Volatility-adaptive polling
+
+Every observed price is recorded per product_id in PRICE_HISTORY_FILE
+(only changes are stored, plus when the product was first and last seen).
+With ADAPTIVE_POLLING on, each product's check interval is derived from
+its user-chosen schedule_interval and that history:
+
+- price within ADAPTIVE_NEAR_TARGET_PCT of the target (or below it): halved
+- two or more changes in the last ADAPTIVE_LOOKBACK_HOURS: halved
+- unchanged for ADAPTIVE_STATIC_DAYS: doubled (twice as long: quadrupled)
+
+Intervals are rounded up to hours that divide the day and kept between
+ADAPTIVE_MIN_INTERVAL_HOURS and ADAPTIVE_MAX_INTERVAL_HOURS. If the plan
+needs more than ADAPTIVE_DAILY_BUDGET checks a day, the least interesting
+products (static first, volatile and near-target last) are stretched until
+it fits. Products without history keep their own interval.
+"""
+
+import os
+import json
+import time
+import heapq
+import atexit
+import threading
+import logging
+
+from product_tracker.config import (
+    ADAPTIVE_DAILY_BUDGET,
+    ADAPTIVE_MIN_INTERVAL_HOURS,
+    ADAPTIVE_MAX_INTERVAL_HOURS,
+    ADAPTIVE_NEAR_TARGET_PCT,
+    ADAPTIVE_LOOKBACK_HOURS,
+    ADAPTIVE_STATIC_DAYS,
+    PRICE_HISTORY_FILE,
+    PRICE_HISTORY_DAYS,
+)
+from product_tracker.identity import product_id
+
+logger = logging.getLogger(__name__)
+
+# Intervals (hours) that give the same run hours every day
+INTERVAL_STEPS = [1, 2, 3, 4, 6, 8, 12, 24]
+
+
+class PriceHistory:
+    """Persisted product_id -> {changes: [[ts, price]], first_seen, last_seen, checks}"""
+
+    def __init__(self, path=PRICE_HISTORY_FILE, keep_days=PRICE_HISTORY_DAYS, save_interval=60):
+        self.path = path
+        self.keep = keep_days * 86400
+        self.save_interval = save_interval
+        self._products = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._products = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load price history: {e}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            data = json.dumps(self._products)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        # Written aside and swapped in, so a crash mid-write never leaves a truncated file
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save price history: {e}")
+
+    def record(self, pid, price, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._products.setdefault(pid, {'changes': [], 'first_seen': now, 'last_seen': now, 'checks': 0})
+            if not entry['changes'] or entry['changes'][-1][1] != price:
+                entry['changes'].append([now, price])
+            # Old changes are dropped, but the current price always stays
+            cutoff = now - self.keep
+            while len(entry['changes']) > 1 and entry['changes'][0][0] < cutoff:
+                entry['changes'].pop(0)
+            entry['last_seen'] = now
+            entry['checks'] += 1
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def get(self, pid):
+        with self._lock:
+            entry = self._products.get(pid)
+            return {**entry, 'changes': list(entry['changes'])} if entry else None
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'products': len(self._products),
+                'changes': sum(len(e['changes']) for e in self._products.values()),
+            }
+
+
+def _step(hours):
+    """Smallest interval step >= hours, within the configured bounds"""
+    steps = [s for s in INTERVAL_STEPS if ADAPTIVE_MIN_INTERVAL_HOURS <= s <= ADAPTIVE_MAX_INTERVAL_HOURS] or [ADAPTIVE_MAX_INTERVAL_HOURS]
+    for step in steps:
+        if step >= hours:
+            return step
+    return steps[-1]
+
+
+def _next_step(hours):
+    larger = [s for s in INTERVAL_STEPS if hours < s <= ADAPTIVE_MAX_INTERVAL_HOURS]
+    return larger[0] if larger else None
+
+
+class AdaptivePlanner:
+    def __init__(self, history, budget=ADAPTIVE_DAILY_BUDGET):
+        self.history = history
+        self.budget = budget
+        self._plan = {}  # product_id -> interval hours
+        self._report = None
+        self._saved_estimate = 0.0
+        self._last_plan = None
+        self._lock = threading.Lock()
+
+    def assess(self, pid, target_price, base_interval, now=None):
+        """(interval hours, reasons, priority) for one product from its price history"""
+        now = time.time() if now is None else now
+        entry = self.history.get(pid)
+        if not entry or not entry['changes']:
+            return _step(base_interval), ['no history'], 1
+
+        factor, reasons, priority = 1.0, [], 1
+        price = entry['changes'][-1][1]
+        if target_price and price is not None and price <= target_price * (1 + ADAPTIVE_NEAR_TARGET_PCT / 100):
+            factor /= 2
+            reasons.append('near target')
+            priority += 2
+        recent = [ts for ts, _ in entry['changes'] if ts > entry['first_seen'] and ts >= now - ADAPTIVE_LOOKBACK_HOURS * 3600]
+        if len(recent) >= 2:
+            factor /= 2
+            reasons.append(f"volatile ({len(recent)} changes)")
+            priority += 1
+        elif not reasons:
+            unchanged_days = (now - entry['changes'][-1][0]) / 86400
+            if unchanged_days >= 2 * ADAPTIVE_STATIC_DAYS:
+                factor *= 4
+            elif unchanged_days >= ADAPTIVE_STATIC_DAYS:
+                factor *= 2
+            if factor > 1:
+                reasons.append(f"static {unchanged_days:.0f}d")
+                priority = 0
+        return _step(base_interval * factor), reasons or ['steady'], priority
+
+    def plan(self, products, runs_per_day, now=None):
+        """Recompute every product's interval; runs_per_day(item, interval) counts its daily checks"""
+        now = time.time() if now is None else now
+        by_pid = {}
+        for item in products:
+            by_pid.setdefault(item['product_id'], []).append(item)
+
+        plan, reasons, priorities, runs, fixed = {}, {}, {}, {}, 0
+        for pid, items in by_pid.items():
+            # Schedules of the same product share one interval: the most frequent any of them asks for
+            assessed = [self.assess(pid, i.get('target_price'), i.get('schedule_interval', 4), now) for i in items]
+            plan[pid], reasons[pid], priorities[pid] = min(assessed, key=lambda a: a[0])
+            runs[pid] = sum(runs_per_day(i, plan[pid]) for i in items)
+            fixed += sum(runs_per_day(i, i.get('schedule_interval', 4)) for i in items)
+
+        total = sum(runs.values())
+        if self.budget and total > self.budget:
+            heap = [(priorities[pid], -runs[pid], pid) for pid in plan]
+            heapq.heapify(heap)
+            while total > self.budget and heap:
+                priority, _, pid = heapq.heappop(heap)
+                longer = _next_step(plan[pid])
+                if longer is None:
+                    continue
+                new_runs = sum(runs_per_day(i, longer) for i in by_pid[pid])
+                total += new_runs - runs[pid]
+                plan[pid], runs[pid] = longer, new_runs
+                if 'budget' not in reasons[pid]:
+                    reasons[pid] = reasons[pid] + ['budget']
+                heapq.heappush(heap, (priority, -new_runs, pid))
+
+        with self._lock:
+            if self._last_plan is not None and self._report:
+                elapsed_days = (now - self._last_plan) / 86400
+                self._saved_estimate += self._report['checks_saved_per_day'] * elapsed_days
+            self._last_plan = now
+            self._plan = plan
+            self._report = {
+                'products': len(plan),
+                'budget_per_day': self.budget or None,
+                'fixed_checks_per_day': fixed,
+                'adaptive_checks_per_day': total,
+                'checks_saved_per_day': fixed - total,
+                'over_budget': bool(self.budget and total > self.budget),
+                'intervals': {
+                    pid: {
+                        'base_hours': min(i.get('schedule_interval', 4) for i in by_pid[pid]),
+                        'hours': plan[pid],
+                        'checks_per_day': runs[pid],
+                        'reasons': reasons[pid],
+                    }
+                    for pid in plan
+                },
+            }
+        logger.info(f"📉 Adaptive polling: {total} checks/day (fixed: {fixed}) for {len(plan)} products")
+        return plan
+
+    def interval_for(self, item):
+        """Planned interval for a scheduled product, or None before it was planned"""
+        with self._lock:
+            return self._plan.get(item['product_id'])
+
+    def get_status(self):
+        with self._lock:
+            status = dict(self._report) if self._report else {'products': 0}
+            status['checks_saved_estimate'] = round(self._saved_estimate, 1)
+        status['price_history'] = self.history.get_status()
+        return status
+
+
+# Global history and planner instances
+price_history = PriceHistory()
+atexit.register(price_history.save)
+adaptive_planner = AdaptivePlanner(price_history)
+
+
+def record_price(product_url, price):
+    """Remember an observed price for adaptive polling; failed scrapes are not recorded"""
+    if price is not None:
+        price_history.record(product_id(product_url), price)
+
+
+def get_adaptive_status():
+    """Planned intervals, checks saved against fixed intervals and history size"""
+    return adaptive_planner.get_status()
@@ -0,0 +1,200 @@
+"""
+Admission control and per-job deadlines for scraping
+
+Browser fetches and plain HTTP fetches get separate concurrency limits
+(ADMISSION_BROWSER_SLOTS / ADMISSION_HTTP_SLOTS), so a burst of scheduled
+jobs queues for a slot instead of starting a browser per thread. Queue
+depth and wait times per kind show when capacity is the bottleneck.
+
+Every product check runs under a hard deadline (JOB_DEADLINE). Threads
+cannot be killed, so the deadline is enforced where a check can block:
+queueing for a slot, a domain's rate limit or a pooled browser is capped
+by the time left, HTTP timeouts and page-ready waits are shortened, and a
+watchdog quits a browser that is still busy when time runs out. Quitting
+makes the blocked Selenium call fail, and the pool discards that driver.
+"""
+
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+from product_tracker.config import (
+    JOB_DEADLINE,
+    ADMISSION_BROWSER_SLOTS,
+    ADMISSION_HTTP_SLOTS,
+    ADMISSION_MAX_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The product check ran out of its time budget"""
+
+
+class AdmissionTimeout(RuntimeError):
+    """No fetch slot became free in time"""
+
+
+_local = threading.local()
+
+_deadline_stats = {'runs': 0, 'exceeded': 0, 'drivers_killed': 0}
+_deadline_lock = threading.Lock()
+
+
+def _count(key):
+    with _deadline_lock:
+        _deadline_stats[key] += 1
+
+
+@contextmanager
+def job_deadline(seconds=JOB_DEADLINE):
+    """Run the block under a deadline; a tighter enclosing deadline still applies"""
+    previous = getattr(_local, 'deadline', None)
+    if seconds:
+        ends = time.monotonic() + seconds
+        _local.deadline = ends if previous is None else min(previous, ends)
+    _count('runs')
+    try:
+        yield
+    except DeadlineExceeded:
+        _count('exceeded')
+        raise
+    finally:
+        _local.deadline = previous
+
+
+def time_left():
+    """Seconds until the current thread's deadline, or None without one"""
+    deadline = getattr(_local, 'deadline', None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(stage):
+    left = time_left()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline passed before {stage}")
+
+
+def bounded(timeout, stage='waiting'):
+    """timeout shortened to the time left; raises once the deadline has passed"""
+    check_deadline(stage)
+    left = time_left()
+    return timeout if left is None else min(timeout, left)
+
+
+@contextmanager
+def driver_watchdog(driver):
+    """Quit the driver if the block is still running at the deadline"""
+    left = time_left()
+    if left is None:
+        yield
+        return
+    fired = threading.Event()
+
+    def expire():
+        fired.set()
+        _count('drivers_killed')
+        logger.warning("⏰ Job deadline reached, quitting its browser")
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error quitting driver at deadline: {e}")
+
+    timer = threading.Timer(max(0.0, left), expire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    except Exception as e:
+        if fired.is_set():
+            raise DeadlineExceeded(f"Browser killed at the job deadline ({type(e).__name__})") from e
+        raise
+    finally:
+        timer.cancel()
+    if fired.is_set():
+        raise DeadlineExceeded("Browser killed at the job deadline")
+
+
+class _SlotPool:
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.waited = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class AdmissionController:
+    def __init__(self, limits, max_wait=ADMISSION_MAX_WAIT):
+        self.max_wait = max_wait
+        self._pools = {kind: _SlotPool(limit) for kind, limit in limits.items()}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def admit(self, kind):
+        """Hold one of kind's slots for the block; waits at most max_wait or the time left"""
+        pool = self._pools[kind]
+        timeout = bounded(self.max_wait, f"queueing for a {kind} slot")
+        started = time.monotonic()
+        with self._cond:
+            full = pool.limit and pool.in_flight >= pool.limit
+            if full:
+                pool.queued += 1
+                pool.max_queued = max(pool.max_queued, pool.queued)
+                try:
+                    while pool.in_flight >= pool.limit:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0:
+                            pool.timed_out += 1
+                            raise AdmissionTimeout(f"No {kind} fetch slot free within {timeout:.1f}s ({pool.in_flight} running)")
+                        self._cond.wait(remaining)
+                finally:
+                    pool.queued -= 1
+            waited = time.monotonic() - started
+            pool.in_flight += 1
+            pool.admitted += 1
+            pool.total_wait += waited
+            pool.max_wait = max(pool.max_wait, waited)
+            if full:
+                pool.waited += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                pool.in_flight -= 1
+                self._cond.notify_all()
+
+    def get_status(self):
+        with self._cond:
+            kinds = {
+                kind: {
+                    'limit': pool.limit,
+                    'in_flight': pool.in_flight,
+                    'queued': pool.queued,
+                    'max_queued': pool.max_queued,
+                    'admitted': pool.admitted,
+                    'waited': pool.waited,
+                    'timed_out': pool.timed_out,
+                    'mean_wait_ms': round(1000 * pool.total_wait / pool.admitted, 1) if pool.admitted else None,
+                    'max_wait_ms': round(1000 * pool.max_wait, 1),
+                }
+                for kind, pool in self._pools.items()
+            }
+        with _deadline_lock:
+            deadlines = dict(_deadline_stats, deadline_s=JOB_DEADLINE)
+        return {'max_wait_s': self.max_wait, 'slots': kinds, 'deadlines': deadlines}
+
+
+# Global admission controller, keyed by fetch tier
+admission = AdmissionController({'browser': ADMISSION_BROWSER_SLOTS, 'http': ADMISSION_HTTP_SLOTS})
+
+
+def get_admission_status():
+    """Fetch slot usage, queue depth and waits per kind, and deadline counters"""
+    return admission.get_status()
@@ -1,11 +1,52 @@
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-import time
 import os
 
-def get_chrome_driver():
+from product_tracker.config import BROWSER_PRICE_ONLY
+from product_tracker.fetchers import fetch_browser
+from product_tracker.selector_stats import selector_stats
+
+# Requests a price-only browser never needs: images, fonts, media and the
+# ad/analytics hosts that product pages pull in
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    '*doubleclick.net*', '*googlesyndication.com*', '*google-analytics.com*',
+    '*googletagmanager.com*', '*facebook.net*', '*facebook.com/tr*',
+    '*amazon-adsystem.com*', '*fls-eu.amazon*', '*fls-na.amazon*', '*unagi.amazon*',
+    '*hotjar.com*', '*clarity.ms*', '*criteo.*', '*branch.io*', '*appsflyer.com*',
+]
+
+def _add_price_only_options(options):
+    """Chrome flags and prefs that turn off everything a price scrape does not use"""
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-default-apps')
+    options.add_argument('--disable-sync')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--mute-audio')
+    options.add_argument('--no-first-run')
+    options.add_argument('--autoplay-policy=user-gesture-required')
+    options.add_argument('--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions')
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.media_stream': 2,
+        'profile.default_content_setting_values.notifications': 2,
+        'profile.default_content_setting_values.geolocation': 2,
+    })
+
+def _block_resources(driver):
+    """Drop blocked resource types and third-party hosts at the network layer"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"[get_chrome_driver] Could not enable request blocking: {e}")
+
+def get_chrome_driver(price_only=BROWSER_PRICE_ONLY):
     """Get Chrome driver with appropriate configuration for Render deployment"""
     options = Options()
     options.add_argument('--headless')
@@ -15,45 +56,80 @@ def get_chrome_driver():
     options.add_argument('--window-size=1920,1080')
     options.add_argument('--lang=en-US')
     options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    if price_only:
+        _add_price_only_options(options)
     
     # Check if running on Render
     if os.environ.get('RENDER'):
         # Render environment - use system chrome
-        return webdriver.Chrome(options=options)
+        driver = webdriver.Chrome(options=options)
     else:
         # Local environment - use local chromedriver
         chromedriver_path = 'chromedriver-win64/chromedriver.exe'
         if os.path.exists(chromedriver_path):
             service = Service(chromedriver_path)
-            return webdriver.Chrome(service=service, options=options)
+            driver = webdriver.Chrome(service=service, options=options)
         else:
             # Fallback to system chrome
-            return webdriver.Chrome(options=options)
+            driver = webdriver.Chrome(options=options)
+    
+    if price_only:
+        _block_resources(driver)
+    return driver
+
+# Price selectors in priority order
+AMAZON_PRICE_SELECTORS = [
+    '#priceblock_ourprice',
+    '#priceblock_dealprice',
+    '#priceblock_saleprice',
+    'span.a-price > span.a-offscreen',
+    'span.a-price-whole',
+]
+
+# Evaluated in the live page in one execute_script call, in priority order
+AMAZON_PRICE_GROUP = 'amazon.price'
+AMAZON_PRICE_PROBES = {'price': {'group': AMAZON_PRICE_GROUP, 'selectors': AMAZON_PRICE_SELECTORS}}
+
+def _parse_amazon_price_text(text):
+    price_text = text.strip().replace(',', '').replace('₹', '').replace('Rs.', '').strip()
+    if not price_text:
+        return None
+    digits = ''.join(filter(lambda c: c.isdigit() or c=='.', price_text)).strip('.')
+    return float(digits) if digits else None
+
+def extract_amazon_price(soup):
+    print(f"[extract_amazon_price] Called with: soup=<BeautifulSoup object>")
+    for sel in AMAZON_PRICE_SELECTORS:
+        elem = soup.select_one(sel)
+        if elem is None:
+            continue
+        try:
+            price = _parse_amazon_price_text(elem.get_text())
+        except ValueError:
+            continue
+        if price is not None:
+            selector_stats.record_hit(AMAZON_PRICE_GROUP, sel)
+            print(f"[extract_amazon_price] Returning: {price} (selector={sel})")
+            return price
+    print(f"[extract_amazon_price] Returning: None (no selector matched)")
+    return None
+
+def extract_amazon_page_price(page):
+    """Price from the browser probe when one ran, otherwise from the parsed page"""
+    probe = page.probes.get('price')
+    if probe:
+        try:
+            price = _parse_amazon_price_text(probe['text'])
+        except ValueError:
+            price = None
+        if price is not None:
+            print(f"[extract_amazon_page_price] Returning: {price} (probe selector={probe['selector']})")
+            return price
+    return extract_amazon_price(page.soup)
 
 def get_amazon_price_selenium(url):
     print(f"[get_amazon_price_selenium] Called with: url={url}")
-    driver = get_chrome_driver()
-    driver.get(url)
-    time.sleep(3)
-    price = None
-    try:
-        selectors = [
-            (By.ID, 'priceblock_ourprice'),
-            (By.ID, 'priceblock_dealprice'),
-            (By.ID, 'priceblock_saleprice'),
-            (By.CSS_SELECTOR, 'span.a-price > span.a-offscreen'),
-            (By.CSS_SELECTOR, 'span.a-price-whole'),
-        ]
-        for by, sel in selectors:
-            try:
-                elem = driver.find_element(by, sel)
-                price_text = elem.text.strip().replace(',', '').replace('₹', '').replace('Rs.', '').strip()
-                if price_text:
-                    price = float(''.join(filter(lambda c: c.isdigit() or c=='.', price_text)))
-                    break
-            except Exception:
-                continue
-    finally:
-        driver.quit()
+    page = fetch_browser(url, probes=AMAZON_PRICE_PROBES)
+    price = extract_amazon_page_price(page)
     print(f"[get_amazon_price_selenium] Returning: {price}")
     return price
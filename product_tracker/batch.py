@@ -0,0 +1,161 @@
+"""
+Asyncio batch scraping engine
+
+Scrapes many scheduled products concurrently instead of one blocking
+APScheduler thread per product. Concurrency is capped globally and per
+domain; results are yielded as they complete.
+
+Usage:
+    python -m product_tracker.batch              # scrape all scheduled products
+    python -m product_tracker.batch --benchmark  # compare against a sequential loop
+"""
+
+import asyncio
+import time
+import logging
+
+from product_tracker.config import BATCH_MAX_CONCURRENCY, BATCH_PER_DOMAIN_CONCURRENCY
+from product_tracker.urls import get_domain
+from product_tracker.identity import build_product_index
+from product_tracker.ratelimit import CircuitOpenError, RateLimitExceeded
+from product_tracker.admission import AdmissionTimeout, job_deadline
+
+logger = logging.getLogger(__name__)
+
+
+def _scrape_item(idx, item):
+    """Blocking scrape of one scheduled product; never raises"""
+    from product_tracker.tracker import scrape_price_and_coupons, find_alternate_prices
+    started = time.monotonic()
+    result = {
+        'idx': idx,
+        'item': item,
+        'product_url': item['product_url'],
+        'product_id': item['product_id'],
+        'price': None,
+        'title': None,
+        'coupon': None,
+        'alternates': [],
+        'error': None,
+        'skipped': None,
+    }
+    try:
+        with job_deadline():
+            result['price'], result['title'], result['coupon'] = scrape_price_and_coupons(item['product_url'])
+            result['alternates'] = find_alternate_prices(item['product_url'], result['title'])
+    except (CircuitOpenError, RateLimitExceeded, AdmissionTimeout) as e:
+        # The site is blocking or throttling us, or no fetch slot was free; not a failure worth notifying about
+        result['skipped'] = str(e)
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.monotonic() - started
+    return result
+
+
+async def scrape_batch(products, max_concurrency=BATCH_MAX_CONCURRENCY, per_domain=BATCH_PER_DOMAIN_CONCURRENCY):
+    """Scrape products concurrently, yielding result dicts as they complete.
+
+    products is the list returned by load_scheduled(). Schedules that watch
+    the same product are scraped once and the result is yielded for each of
+    them. Each result carries idx, item, product_url, product_id, price,
+    title, coupon, alternates (prices on ALTERNATE_SITES), error, skipped
+    (why a rate-limited or circuit-broken site was not fetched) and elapsed
+    seconds.
+    """
+    global_limit = asyncio.Semaphore(max_concurrency)
+    domain_limits = {}
+
+    async def run(idxs):
+        first = products[idxs[0]]
+        domain = get_domain(first['product_url'])
+        domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(per_domain))
+        async with domain_limit:
+            async with global_limit:
+                scraped = await asyncio.to_thread(_scrape_item, idxs[0], first)
+        results = []
+        for idx in idxs:
+            result = dict(scraped, idx=idx, item=products[idx], product_url=products[idx]['product_url'])
+            results.append(result)
+        return results
+
+    index = build_product_index(products)
+    tasks = [asyncio.create_task(run(idxs)) for idxs in index.values()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for result in await finished:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def run_batch(products, on_result=None, **kwargs):
+    """Synchronous wrapper around scrape_batch for threads without an event loop.
+
+    on_result(result) is called as each product completes; the full list of
+    results is returned in completion order.
+    """
+    async def collect():
+        results = []
+        async for result in scrape_batch(products, **kwargs):
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+
+    return asyncio.run(collect())
+
+
+def benchmark(products):
+    """Compare wall-clock time of the sequential loop against the batch engine.
+
+    The sequential side scrapes one product after another, which is what
+    looping trigger_job_now over every index does, minus the notifications.
+    """
+    started = time.monotonic()
+    for idx, item in enumerate(products):
+        _scrape_item(idx, item)
+    sequential = time.monotonic() - started
+
+    started = time.monotonic()
+    run_batch(products)
+    batched = time.monotonic() - started
+
+    return {
+        'products': len(products),
+        'distinct_products': len(build_product_index(products)),
+        'sequential_s': round(sequential, 2),
+        'batch_s': round(batched, 2),
+        'speedup': round(sequential / batched, 2) if batched else None,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+    from product_tracker.database import load_scheduled
+
+    parser = argparse.ArgumentParser(description='Scrape all scheduled products concurrently')
+    parser.add_argument('--benchmark', action='store_true', help='compare against the sequential loop')
+    parser.add_argument('--limit', type=int, default=None, help='only use the first N products')
+    args = parser.parse_args(argv)
+
+    products = load_scheduled()[:args.limit]
+    if args.benchmark:
+        print(json.dumps(benchmark(products), indent=2))
+        return
+
+    def show(result):
+        if result['error']:
+            status = f"ERROR {result['error']}"
+        elif result['skipped']:
+            status = f"SKIPPED {result['skipped']}"
+        else:
+            status = f"price={result['price']} coupon={result['coupon']}"
+        print(f"[{result['idx']}] {result['elapsed']:.1f}s {status} | {result['product_url']}")
+
+    run_batch(products, on_result=show)
+
+
+if __name__ == '__main__':
+    main()
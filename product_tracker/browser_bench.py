@@ -0,0 +1,134 @@
+"""
+Before/after measurements for the price-only browser profile
+
+Loads a set of product pages with the full Chrome profile and with the
+price-only profile (BROWSER_PRICE_ONLY) and reports bytes transferred,
+time until the price is on the page, and browser memory for each.
+
+Usage:
+    python -m product_tracker.browser_bench saved_pages/             # saved .html / .html.gz files
+    python -m product_tracker.browser_bench https://www.amazon.in/dp/X ...
+
+Saved pages are served from a local HTTP server so the browser reports
+real transfer sizes for the resources they reference.
+"""
+
+import os
+import gzip
+import json
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+_TRANSFER_SIZE_JS = """
+var total = 0;
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+for (var i = 0; i < entries.length; i++) { total += entries[i].transferSize || 0; }
+return [total, entries.length];
+"""
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_directory(directory):
+    """Serve saved pages over HTTP; .html.gz files are unpacked first"""
+    root = tempfile.mkdtemp(prefix='browser_bench_')
+    names = []
+    for name in sorted(os.listdir(directory)):
+        source = os.path.join(directory, name)
+        if name.endswith('.html.gz'):
+            target = name[:-3]
+            with gzip.open(source, 'rb') as src, open(os.path.join(root, target), 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+        elif name.endswith('.html'):
+            target = name
+            shutil.copy(source, os.path.join(root, target))
+        else:
+            continue
+        names.append(target)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/{name}" for name in names]
+    return server, root, urls
+
+
+def measure_profile(urls, price_only):
+    """Load every URL in one browser with the given profile and collect metrics"""
+    from product_tracker.amazon import get_chrome_driver
+    from product_tracker.browser_pool import _PooledDriver
+    from product_tracker.readiness import wait_until_ready
+
+    driver = get_chrome_driver(price_only=price_only)
+    pages = []
+    peak_rss = None
+    try:
+        for url in urls:
+            started = time.monotonic()
+            driver.get(url)
+            ready = wait_until_ready(driver, url)
+            elapsed = time.monotonic() - started
+            transferred, requests = driver.execute_script(_TRANSFER_SIZE_JS)
+            rss = _PooledDriver(driver).rss_mb()
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+            pages.append({
+                'url': url,
+                'ready': ready,
+                'ready_s': round(elapsed, 3),
+                'bytes': transferred,
+                'requests': requests,
+                'rss_mb': round(rss, 1) if rss is not None else None,
+            })
+    finally:
+        driver.quit()
+
+    count = len(pages) or 1
+    return {
+        'price_only': price_only,
+        'avg_ready_s': round(sum(p['ready_s'] for p in pages) / count, 3),
+        'avg_bytes': int(sum(p['bytes'] for p in pages) / count),
+        'avg_requests': round(sum(p['requests'] for p in pages) / count, 1),
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'pages': pages,
+    }
+
+
+def benchmark_profiles(urls):
+    """Compare the full profile against the price-only profile on the same pages"""
+    full = measure_profile(urls, price_only=False)
+    lean = measure_profile(urls, price_only=True)
+    summary = {}
+    for key in ('avg_ready_s', 'avg_bytes', 'avg_requests', 'peak_rss_mb'):
+        if full[key] and lean[key] is not None:
+            summary[key] = f"{full[key]} -> {lean[key]} ({100 * (lean[key] - full[key]) / full[key]:+.0f}%)"
+    return {'summary': summary, 'full': full, 'price_only': lean}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure the price-only browser profile')
+    parser.add_argument('targets', nargs='+', help='a directory of saved pages, or product URLs')
+    args = parser.parse_args(argv)
+
+    server = root = None
+    if len(args.targets) == 1 and os.path.isdir(args.targets[0]):
+        server, root, urls = _serve_directory(args.targets[0])
+    else:
+        urls = args.targets
+    try:
+        print(json.dumps(benchmark_profiles(urls), indent=2))
+    finally:
+        if server:
+            server.shutdown()
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Headless Chrome pool for Selenium scraping
+
+Keeps a small, bounded set of warm WebDriver instances that scrape calls
+lease and return instead of paying a full Chrome + chromedriver cold start
+on every product check.
+"""
+
+import atexit
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+from product_tracker.config import (
+    BROWSER_POOL_SIZE,
+    BROWSER_POOL_LEASE_TIMEOUT,
+    BROWSER_MAX_PAGES,
+    BROWSER_MAX_RSS_MB,
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # RSS based recycling is disabled without psutil
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledDriver:
+    """A WebDriver plus the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+        self.broken = False
+
+    def rss_mb(self):
+        """Resident memory of chromedriver and all its Chrome children, in MB"""
+        if psutil is None:
+            return None
+        try:
+            pid = self.driver.service.process.pid
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+            total = 0
+            for proc in procs:
+                try:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+
+class DriverPool:
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES, max_rss_mb=BROWSER_MAX_RSS_MB):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle = []
+        self._leased = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Counters for the debug pages
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.leases = 0
+
+    def _create(self):
+        from product_tracker.amazon import get_chrome_driver
+        driver = get_chrome_driver()
+        self.created += 1
+        logger.info(f"🌐 Started pooled Chrome driver (total created: {self.created})")
+        return _PooledDriver(driver)
+
+    def _destroy(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error quitting pooled driver: {e}")
+
+    def _is_alive(self, pooled):
+        """Cheap liveness probe; a crashed Chrome raises on any command"""
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, pooled):
+        """Clear per-site state so the next lease starts from a clean browser"""
+        driver = pooled.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # delete_all_cookies only covers the current document's domain; profile
+        # cookies of every domain must go before the next lease
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            pass
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def _needs_recycle(self, pooled):
+        if pooled.broken:
+            return True
+        if self.max_pages and pooled.pages >= self.max_pages:
+            return True
+        if self.max_rss_mb:
+            rss = pooled.rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                logger.info(f"♻️ Recycling driver at {rss:.0f} MB RSS")
+                return True
+        return False
+
+    def acquire(self, timeout=BROWSER_POOL_LEASE_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    self._leased += 1
+                    break
+                if self._leased < self.size:
+                    self._leased += 1
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser available within {timeout}s")
+                self._cond.wait(remaining)
+
+        # Create or health-check outside the lock so other leases are not blocked
+        try:
+            if pooled is not None and not self._is_alive(pooled):
+                self.crashed += 1
+                logger.warning("⚠️ Pooled driver crashed while idle, replacing it")
+                self._destroy(pooled)
+                pooled = None
+            if pooled is None:
+                pooled = self._create()
+        except Exception:
+            with self._cond:
+                self._leased -= 1
+                self._cond.notify()
+            raise
+
+        self.leases += 1
+        return pooled
+
+    def release(self, pooled):
+        pooled.pages += 1
+        keep = not self._needs_recycle(pooled)
+        if keep:
+            try:
+                self._reset(pooled)
+            except Exception as e:
+                logger.warning(f"⚠️ Driver reset failed, discarding it: {e}")
+                self.crashed += 1
+                keep = False
+        if not keep:
+            self.recycled += 1
+            self._destroy(pooled)
+
+        with self._cond:
+            self._leased -= 1
+            if keep and not self._closed:
+                self._idle.append(pooled)
+            elif keep:
+                self._destroy(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout=BROWSER_POOL_LEASE_TIMEOUT):
+        """Lease a warm driver for the duration of a ``with`` block.
+
+        Any exception raised inside the block marks the driver as broken so it
+        is replaced rather than handed to the next caller in an unknown state.
+        """
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled.driver
+        except Exception:
+            pooled.broken = True
+            raise
+        finally:
+            self.release(pooled)
+
+    def recycle_idle(self):
+        """Quit idle drivers (they are recreated on demand) to give memory back"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self.recycled += 1
+            self._destroy(pooled)
+        return len(idle)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+
+    def get_status(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'leased': self._leased,
+                'created': self.created,
+                'recycled': self.recycled,
+                'crashed': self.crashed,
+                'leases': self.leases,
+                'max_pages': self.max_pages,
+                'max_rss_mb': self.max_rss_mb if psutil is not None else None,
+            }
+
+
+# Global driver pool instance
+driver_pool = DriverPool()
+atexit.register(driver_pool.shutdown)
+
+
+def lease_driver(timeout=BROWSER_POOL_LEASE_TIMEOUT):
+    """Lease a pooled Chrome driver (context manager)"""
+    return driver_pool.lease(timeout)
+
+
+def get_browser_pool_status():
+    """Get driver pool counters"""
+    return driver_pool.get_status()
+
+
+def shutdown_browser_pool():
+    """Quit all idle pooled drivers"""
+    driver_pool.shutdown()
@@ -0,0 +1,275 @@
+"""
+Cross-site best-price comparison
+
+For a tracked product, the same item is looked up on every site in
+ALTERNATE_SITES (other than the product's own) concurrently, and whatever
+finishes within COMPARE_DEADLINE seconds is returned; slower sites are left
+out of this run.
+
+Finding the product on another site needs a search, so the match (or the
+fact that there is none) is cached per product_id in COMPARE_MATCH_FILE for
+COMPARE_MATCH_TTL_HOURS. Later runs go straight to the matched product page.
+A search that completes after the deadline still caches its match.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import quote_plus, urljoin
+
+from product_tracker.config import (
+    ALTERNATE_SITES,
+    COMPARE_DEADLINE,
+    COMPARE_MATCH_FILE,
+    COMPARE_MATCH_TTL_HOURS,
+    COMPARE_MIN_SIMILARITY,
+    RATE_LIMIT_MAX_WAIT,
+)
+from product_tracker.urls import get_domain
+from product_tracker.identity import product_id, normalize_url
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Title suffixes shops append after the product name
+_TITLE_SUFFIX_RE = re.compile(r'\s*(?:\||:\s*Amazon\.in|-\s*Buy .*|Online at .*).*$', re.IGNORECASE)
+
+
+def _title_words(title):
+    return _WORD_RE.findall(_TITLE_SUFFIX_RE.sub('', title or '').lower())
+
+
+def search_query(title):
+    """Short search query from a product page title"""
+    return ' '.join(_title_words(title)[:10])
+
+
+def title_similarity(a, b):
+    """Share of the source title's words found in the candidate title"""
+    words_a, words_b = set(_title_words(a)), set(_title_words(b))
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a)
+
+
+def _first_amazon_result(soup, base_url):
+    for item in soup.select('div.s-result-item[data-asin]'):
+        asin = item.get('data-asin')
+        if asin and 'AdHolder' not in (item.get('class') or []):
+            return f"{base_url.rstrip('/')}/dp/{asin}"
+    return None
+
+
+def _first_flipkart_result(soup, base_url):
+    link = soup.select_one('a[href*="/p/itm"]')
+    return normalize_url(urljoin(base_url, link['href'])) if link else None
+
+
+# Search page path and result parser per site marker
+SEARCH_ENGINES = {
+    'amazon.': ('/s?k={query}', _first_amazon_result),
+    'flipkart.': ('/search?q={query}', _first_flipkart_result),
+}
+
+
+def _search_engine(site_url):
+    for marker, engine in SEARCH_ENGINES.items():
+        if marker in site_url:
+            return engine
+    return None
+
+
+class MatchCache:
+    """Persisted product_id -> {site domain: matched product URL or None}"""
+
+    def __init__(self, path=COMPARE_MATCH_FILE, ttl_hours=COMPARE_MATCH_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self._matches = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._matches = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load alternate site matches: {e}")
+
+    def _save(self):
+        data = json.dumps(self._matches, indent=2)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save alternate site matches: {e}")
+
+    def get(self, pid, site):
+        """Cached entry {'url', 'matched_at'} or None when unknown or expired"""
+        with self._lock:
+            entry = self._matches.get(pid, {}).get(site)
+        if entry and time.time() - entry['matched_at'] < self.ttl:
+            return entry
+        return None
+
+    def put(self, pid, site, url):
+        with self._lock:
+            self._matches.setdefault(pid, {})[site] = {'url': url, 'matched_at': time.time()}
+            self._save()
+
+    def get_status(self):
+        with self._lock:
+            entries = [e for sites in self._matches.values() for e in sites.values()]
+        return {
+            'products': len(self._matches),
+            'matches': sum(1 for e in entries if e['url']),
+            'no_match': sum(1 for e in entries if not e['url']),
+        }
+
+
+class PriceComparer:
+    def __init__(self, sites=ALTERNATE_SITES, deadline=COMPARE_DEADLINE, min_similarity=COMPARE_MIN_SIMILARITY):
+        self.sites = list(sites)
+        self.deadline = deadline
+        self.min_similarity = min_similarity
+        self.matches = MatchCache()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.sites) * 2), thread_name_prefix='compare')
+        self._lock = threading.Lock()
+
+        # Counters for the debug pages
+        self.runs = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.searches = 0
+        self.cached_lookups = 0
+
+    def _search(self, site_url, title):
+        """Search a site for the product; returns the first result's URL or None"""
+        from product_tracker.fetchers import fetch_http
+        from product_tracker.escalation import detect_bot_wall
+        from product_tracker.ratelimit import domain_guard, is_site_failure
+        from product_tracker.admission import admission, bounded
+
+        path, parse_results = _search_engine(site_url)
+        query = search_query(title)
+        if not query:
+            return None
+        domain = get_domain(site_url)
+        with admission.admit('http'):
+            domain_guard.acquire(domain, max_wait=bounded(RATE_LIMIT_MAX_WAIT, f"search on {domain}"))
+            with self._lock:
+                self.searches += 1
+            try:
+                page = fetch_http(site_url.rstrip('/') + path.format(query=quote_plus(query)))
+            except Exception as e:
+                if is_site_failure(e):
+                    domain_guard.record(domain, False, f"search: {type(e).__name__}")
+                else:
+                    domain_guard.release(domain)
+                raise
+        blocked = detect_bot_wall(page)
+        domain_guard.record(domain, not blocked, 'search: bot wall' if blocked else None)
+        if blocked:
+            raise RuntimeError(f"Search on {domain} hit a bot wall")
+        return parse_results(page.soup, site_url)
+
+    def _check_site(self, pid, site_url, title):
+        from product_tracker.admission import job_deadline
+        # Late sites keep running past the comparison deadline to cache their match, but not forever
+        with job_deadline():
+            return self._check_site_within_deadline(pid, site_url, title)
+
+    def _check_site_within_deadline(self, pid, site_url, title):
+        from product_tracker.tracker import scrape_price_and_coupons
+
+        started = time.monotonic()
+        site = get_domain(site_url)
+        entry = self.matches.get(pid, site)
+        cached = entry is not None
+        if cached:
+            with self._lock:
+                self.cached_lookups += 1
+            match_url = entry['url']
+        else:
+            match_url = self._search(site_url, title)
+        result = {'site': site, 'url': match_url, 'price': None, 'title': None, 'coupon': None, 'cached_match': cached}
+        if match_url:
+            result['price'], result['title'], result['coupon'] = scrape_price_and_coupons(match_url)
+            # A fresh search result has to look like the same product before it is trusted
+            if not cached and title_similarity(title, result['title']) < self.min_similarity:
+                logger.info(f"🚫 Rejected {site} match {match_url} (title mismatch: {result['title']!r})")
+                match_url = result['url'] = None
+                result['price'] = result['title'] = result['coupon'] = None
+        if not cached:
+            self.matches.put(pid, site, match_url)
+        result['elapsed'] = round(time.monotonic() - started, 2)
+        return result
+
+    def compare(self, product_url, title, deadline=None):
+        """Prices of the same product on the alternate sites that answered before the deadline"""
+        from product_tracker.admission import bounded
+
+        # Never wait past the calling job's own deadline
+        deadline = bounded(self.deadline if deadline is None else deadline, 'comparing alternate sites')
+        own_domain = get_domain(product_url)
+        pid = product_id(product_url)
+        sites = [s for s in self.sites if get_domain(s) != own_domain and _search_engine(s)]
+        if not sites:
+            return []
+
+        futures = {self._executor.submit(self._check_site, pid, site, title): site for site in sites}
+        done, pending = wait(futures, timeout=deadline)
+        results = []
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️ Comparison on {get_domain(futures[future])} failed: {e}")
+                continue
+            if result['url']:
+                results.append(result)
+        with self._lock:
+            self.runs += 1
+            self.completed += len(done)
+            self.timed_out += len(pending)
+        if pending:
+            logger.info(f"⏱️ Comparison deadline of {deadline:.1f}s passed; skipped {[get_domain(futures[f]) for f in pending]}")
+        logger.info(f"🔎 Compared {product_url} on {len(sites)} sites: {len(results)} matches")
+        return results
+
+    def get_status(self):
+        with self._lock:
+            status = {
+                'sites': self.sites,
+                'deadline_s': self.deadline,
+                'runs': self.runs,
+                'sites_completed': self.completed,
+                'sites_timed_out': self.timed_out,
+                'searches': self.searches,
+                'cached_lookups': self.cached_lookups,
+            }
+        status['match_cache'] = self.matches.get_status()
+        return status
+
+
+# Global comparer instance
+price_comparer = PriceComparer()
+
+
+def compare_alternate_sites(product_url, title, deadline=None):
+    """Look the product up on the alternate sites concurrently under a deadline"""
+    return price_comparer.compare(product_url, title, deadline)
+
+
+def get_compare_status():
+    """Cross-site comparison counters and match cache size"""
+    return price_comparer.get_status()
@@ -43,9 +43,9 @@ load_chat_aliases()
 
 
 # Whether to check alternate sites for best price
-CHECK_ALTERNATE_SITES = True
+CHECK_ALTERNATE_SITES = os.getenv('CHECK_ALTERNATE_SITES', 'true').lower() == 'true'
 
-# List of alternate sites to check (to be implemented)
+# List of alternate sites to check (each needs a search parser in compare.py)
 ALTERNATE_SITES = [
     'https://www.amazon.in',
     'https://www.flipkart.com',
@@ -54,3 +54,99 @@ ALTERNATE_SITES = [
 
 # Scheduler settings
 SCHEDULE_TIME = '09:00'  # 24-hour format, time to run daily
+SCHEDULE_SPREAD_MINUTES = int(os.getenv('SCHEDULE_SPREAD_MINUTES', '0'))  # Opt-in: spread each product's runs up to this many minutes past its start time (0 = exact)
+SCHEDULER_MODE = os.getenv('SCHEDULER_MODE', 'jobs').lower()  # 'jobs' (one cron job per product) or 'tick' (one periodic job batches due products)
+SCHEDULER_TICK_MINUTES = int(os.getenv('SCHEDULER_TICK_MINUTES', '5'))  # Tick mode: how often due products are collected
+SCHEDULER_JOB_STORE = os.getenv('SCHEDULER_JOB_STORE', 'mongodb').lower()  # 'mongodb' (persisted when MongoDB is connected) or 'memory'
+SCHEDULER_JOBS_COLLECTION = os.getenv('SCHEDULER_JOBS_COLLECTION', 'scheduler_jobs')  # MongoDB collection holding the jobs
+CATCHUP_MAX_RUNS = int(os.getenv('CATCHUP_MAX_RUNS', '20'))  # Missed product runs made up at startup (oldest first)
+CATCHUP_MAX_AGE_HOURS = float(os.getenv('CATCHUP_MAX_AGE_HOURS', '24'))  # Runs missed longer ago than this are not made up
+CATCHUP_PER_MINUTE = int(os.getenv('CATCHUP_PER_MINUTE', '5'))  # Missed runs started per minute during catch-up
+
+# Browser pool settings (Selenium scraping)
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))  # Max concurrent Chrome instances
+BROWSER_POOL_LEASE_TIMEOUT = int(os.getenv('BROWSER_POOL_LEASE_TIMEOUT', '120'))  # Seconds to wait for a free browser
+BROWSER_MAX_PAGES = int(os.getenv('BROWSER_MAX_PAGES', '25'))  # Recycle a browser after this many page loads
+BROWSER_MAX_RSS_MB = int(os.getenv('BROWSER_MAX_RSS_MB', '600'))  # Recycle a browser above this memory (needs psutil)
+
+# Page readiness settings (Selenium scraping)
+PAGE_READY_TIMEOUT = float(os.getenv('PAGE_READY_TIMEOUT', '10'))  # Max seconds to wait for a price/offer element
+PAGE_READY_GRACE = float(os.getenv('PAGE_READY_GRACE', '3'))  # Extra seconds to wait for a site's late elements (Myntra offers) once the price is in
+
+# HTTP session settings (plain HTTP scraping)
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '20'))  # Seconds to wait for response data
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '4'))  # Max keep-alive connections per host
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))  # Retries on connection errors, 429 and 5xx
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '1'))  # Exponential backoff base in seconds
+
+# Batch scraping settings
+BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', '8'))  # Products scraped at once across all sites
+BATCH_PER_DOMAIN_CONCURRENCY = int(os.getenv('BATCH_PER_DOMAIN_CONCURRENCY', '2'))  # Products scraped at once per site
+
+# Response cache settings (conditional revalidation of product pages)
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', 'response_cache')  # On-disk cache directory
+
+# Fetch escalation settings (learned per-domain HTTP -> browser policy)
+ESCALATION_WINDOW = int(os.getenv('ESCALATION_WINDOW', '50'))  # Recent attempts remembered per domain and tier
+ESCALATION_MIN_SAMPLES = int(os.getenv('ESCALATION_MIN_SAMPLES', '5'))  # Attempts needed before a tier can be skipped
+ESCALATION_SKIP_BELOW = float(os.getenv('ESCALATION_SKIP_BELOW', '0.2'))  # Skip a tier whose success rate is below this
+ESCALATION_REPROBE_EVERY = int(os.getenv('ESCALATION_REPROBE_EVERY', '10'))  # Still try a skipped tier every Nth check
+COUPON_RECHECK_HOURS = float(os.getenv('COUPON_RECHECK_HOURS', '24'))  # After the browser finds no coupon for a product, skip the browser for its coupon this long
+
+# Lean "price-only" browser profile: block images, fonts, media and trackers
+BROWSER_PRICE_ONLY = os.getenv('BROWSER_PRICE_ONLY', 'true').lower() == 'true'
+
+# Out-of-process render worker (owns every Chrome instance)
+RENDER_WORKER_ENABLED = os.getenv('RENDER_WORKER_ENABLED', 'true').lower() == 'true'
+RENDER_WORKER_CONCURRENCY = int(os.getenv('RENDER_WORKER_CONCURRENCY', '2'))  # Pages rendered at once
+RENDER_WORKER_RSS_BUDGET_MB = int(os.getenv('RENDER_WORKER_RSS_BUDGET_MB', '900'))  # Worker + browsers memory budget (needs psutil)
+RENDER_WORKER_MAX_JOBS = int(os.getenv('RENDER_WORKER_MAX_JOBS', '200'))  # Restart the worker after this many pages
+RENDER_WORKER_TIMEOUT = float(os.getenv('RENDER_WORKER_TIMEOUT', '90'))  # Seconds to wait for a rendered page
+
+# Selector hit counts for the debug pages (persisted across restarts)
+SELECTOR_STATS_FILE = os.getenv('SELECTOR_STATS_FILE', 'selector_stats.json')
+
+# Persistent per-domain cookie profiles shared by the HTTP and browser tiers
+PROFILES_ENABLED = os.getenv('PROFILES_ENABLED', 'true').lower() == 'true'
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'browser_profiles')  # One cookie jar file per domain
+PROFILE_MAX_AGE_HOURS = float(os.getenv('PROFILE_MAX_AGE_HOURS', '72'))  # Start a fresh profile after this age
+PROFILE_ROTATE_AFTER_BLOCKS = int(os.getenv('PROFILE_ROTATE_AFTER_BLOCKS', '3'))  # Start a fresh profile after this many bot walls in a row
+
+# Per-domain rate limit (token bucket) and circuit breaker for page fetches
+RATE_LIMIT_PER_MINUTE = float(os.getenv('RATE_LIMIT_PER_MINUTE', '12'))  # Sustained page fetches per minute per domain (0 = unlimited)
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '3'))  # Fetches allowed back to back before throttling
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '120'))  # Fail instead of queueing longer than this (seconds)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))  # Consecutive failed fetches / bot walls that open the breaker
+BREAKER_COOLDOWN = float(os.getenv('BREAKER_COOLDOWN', '60'))  # First open period in seconds, doubled after each failed trial
+BREAKER_MAX_COOLDOWN = float(os.getenv('BREAKER_MAX_COOLDOWN', '1800'))  # Longest open period in seconds
+
+# Cross-site best-price comparison
+COMPARE_DEADLINE = float(os.getenv('COMPARE_DEADLINE', '25'))  # Seconds to wait for alternate sites; slower ones are skipped
+COMPARE_MATCH_FILE = os.getenv('COMPARE_MATCH_FILE', 'alternate_matches.json')  # Cached product matches per alternate site
+COMPARE_MATCH_TTL_HOURS = float(os.getenv('COMPARE_MATCH_TTL_HOURS', '168'))  # Search again for a match after this age
+COMPARE_MIN_SIMILARITY = float(os.getenv('COMPARE_MIN_SIMILARITY', '0.5'))  # Share of title words a search result must share
+
+# Bounded reading and targeted parsing of product pages
+HTTP_MAX_BODY_BYTES = int(os.getenv('HTTP_MAX_BODY_BYTES', '3000000'))  # Never read more of a page body than this
+HTTP_STOP_MARGIN = int(os.getenv('HTTP_STOP_MARGIN', '32768'))  # Bytes still read after a site's stop markers are seen
+TARGETED_PARSING = os.getenv('TARGETED_PARSING', 'true').lower() == 'true'  # Parse only the tags site extractors read
+
+# Volatility-adaptive polling (per-product check interval from recent price history)
+ADAPTIVE_POLLING = os.getenv('ADAPTIVE_POLLING', 'false').lower() == 'true'  # Off: every product keeps its fixed schedule_interval
+ADAPTIVE_DAILY_BUDGET = int(os.getenv('ADAPTIVE_DAILY_BUDGET', '500'))  # Max product checks per day across all products (0 = unlimited)
+ADAPTIVE_MIN_INTERVAL_HOURS = int(os.getenv('ADAPTIVE_MIN_INTERVAL_HOURS', '1'))  # Never check a product more often than this
+ADAPTIVE_MAX_INTERVAL_HOURS = int(os.getenv('ADAPTIVE_MAX_INTERVAL_HOURS', '24'))  # Never check a product less often than this
+ADAPTIVE_NEAR_TARGET_PCT = float(os.getenv('ADAPTIVE_NEAR_TARGET_PCT', '10'))  # Price within this % of the target counts as near it
+ADAPTIVE_LOOKBACK_HOURS = float(os.getenv('ADAPTIVE_LOOKBACK_HOURS', '72'))  # Window in which price changes count as volatility
+ADAPTIVE_STATIC_DAYS = float(os.getenv('ADAPTIVE_STATIC_DAYS', '7'))  # Unchanged this long (twice as long: back off further)
+ADAPTIVE_REPLAN_MINUTES = int(os.getenv('ADAPTIVE_REPLAN_MINUTES', '60'))  # How often intervals are recomputed from new prices
+PRICE_HISTORY_FILE = os.getenv('PRICE_HISTORY_FILE', 'price_history.json')  # Observed prices per product
+PRICE_HISTORY_DAYS = float(os.getenv('PRICE_HISTORY_DAYS', '30'))  # Price changes older than this are dropped
+
+# Admission control and per-job deadlines for scraping
+JOB_DEADLINE = float(os.getenv('JOB_DEADLINE', '240'))  # Hard limit in seconds for one product check, queueing included
+ADMISSION_BROWSER_SLOTS = int(os.getenv('ADMISSION_BROWSER_SLOTS', '2'))  # Browser fetches running at once
+ADMISSION_HTTP_SLOTS = int(os.getenv('ADMISSION_HTTP_SLOTS', '8'))  # Plain HTTP fetches running at once
+ADMISSION_MAX_WAIT = float(os.getenv('ADMISSION_MAX_WAIT', '120'))  # Give up on a fetch queued longer than this (seconds)
@@ -10,6 +10,8 @@ from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
 
+from product_tracker.identity import product_id
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -134,10 +136,11 @@ class ProductDatabase:
         return self._save_to_json(products)
     
     def remove_product(self, product_url: str) -> bool:
-        """Remove a product by URL"""
+        """Remove one product by URL (any URL for the same canonical product matches)"""
+        target_id = product_id(product_url)
         if self.connected:
             try:
-                result = self.collection.delete_one({'product_url': product_url})
+                result = self.collection.delete_one({'product_id': target_id})
                 if result.deleted_count > 0:
                     logger.info(f"🗑️ Removed product from MongoDB: {product_url}")
                     
@@ -152,11 +155,11 @@ class ProductDatabase:
         
         # Fallback to JSON
         products = self._load_from_json()
-        original_count = len(products)
-        products = [p for p in products if p.get('product_url') != product_url]
-        if len(products) < original_count:
-            self._save_to_json(products)
-            return True
+        for idx, product in enumerate(products):
+            if product['product_id'] == target_id:
+                products.pop(idx)
+                self._save_to_json(products)
+                return True
         return False
     
     def _load_from_json(self) -> List[Dict]:
@@ -214,8 +217,18 @@ db = ProductDatabase()
 
 # Convenience functions for backward compatibility
 def load_scheduled() -> List[Dict]:
-    """Load scheduled products from database"""
-    return db.get_all_products()
+    """Load scheduled products from database, filling in missing or outdated product IDs"""
+    products = db.get_all_products()
+    changed = 0
+    for product in products:
+        pid = product_id(product['product_url'])
+        if product.get('product_id') != pid:
+            product['product_id'] = pid
+            changed += 1
+    if changed:
+        logger.info(f"🆔 Backfilled product_id on {changed} scheduled products")
+        db.save_products(products)
+    return products
 
 def save_scheduled(products: List[Dict]) -> bool:
     """Save scheduled products to database"""
@@ -0,0 +1,156 @@
+"""
+Learned fetch escalation policy
+
+Sites are scraped with the cheapest tier first (plain HTTP) and escalate to
+the browser only when extraction fails or a bot wall is detected. The
+policy keeps rolling success rates per domain and tier so that a domain
+whose HTTP tier almost never works skips straight to the browser, while
+still re-probing the cheap tier now and then in case the site changes.
+
+Coupons are learned per product: when only the browser can show a
+product's offers and it found none, later checks accept "no coupon" from
+the cheap tier for COUPON_RECHECK_HOURS instead of starting Chrome every
+time.
+"""
+
+import re
+import time
+import threading
+from collections import deque
+
+from product_tracker.config import (
+    ESCALATION_WINDOW,
+    ESCALATION_MIN_SAMPLES,
+    ESCALATION_SKIP_BELOW,
+    ESCALATION_REPROBE_EVERY,
+    COUPON_RECHECK_HOURS,
+)
+
+# Text that only shows up on captcha / robot-check / access-denied pages
+_BOT_WALL_RE = re.compile(
+    r'validateCaptcha'
+    r'|Enter the characters you see below'
+    r'|To discuss automated access to Amazon data'
+    r'|<title>\s*(?:Robot Check|Site Maintenance|Access Denied|Attention Required!)'
+    r'|g-recaptcha|cf-challenge|hcaptcha',
+    re.IGNORECASE,
+)
+
+_BOT_WALL_STATUS_CODES = (403, 429, 503)
+
+
+def detect_bot_wall(page):
+    """True if the fetched page is a captcha/robot check instead of the product"""
+    if page.status_code in _BOT_WALL_STATUS_CODES:
+        return True
+    # Block pages are small; only scan the head of large documents
+    return bool(_BOT_WALL_RE.search(page.html[:50000]))
+
+
+class _TierStats:
+    def __init__(self, window):
+        self.outcomes = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)
+        self.attempts = 0
+        self.skipped = 0
+        self.skip_decisions = 0
+
+    def success_rate(self):
+        if not self.outcomes:
+            return None
+        return sum(self.outcomes) / len(self.outcomes)
+
+
+class EscalationPolicy:
+    def __init__(self, window=ESCALATION_WINDOW, min_samples=ESCALATION_MIN_SAMPLES,
+                 skip_below=ESCALATION_SKIP_BELOW, reprobe_every=ESCALATION_REPROBE_EVERY,
+                 coupon_recheck_hours=COUPON_RECHECK_HOURS):
+        self.window = window
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.reprobe_every = reprobe_every
+        self.coupon_recheck = coupon_recheck_hours * 3600
+        self._stats = {}
+        self._no_coupon_since = {}  # product_id -> when the browser last found no coupon
+        self.coupon_skips = 0
+        self._lock = threading.Lock()
+
+    def _tier(self, domain, tier):
+        key = (domain, tier)
+        if key not in self._stats:
+            self._stats[key] = _TierStats(self.window)
+        return self._stats[key]
+
+    def should_skip(self, domain, tier):
+        """Whether to skip a (non-final) tier for this domain based on its history"""
+        with self._lock:
+            stats = self._tier(domain, tier)
+            rate = stats.success_rate()
+            if rate is None or len(stats.outcomes) < self.min_samples or rate >= self.skip_below:
+                return False
+            stats.skip_decisions += 1
+            # Re-probe periodically so a site that starts serving static prices is noticed
+            if self.reprobe_every and stats.skip_decisions % self.reprobe_every == 0:
+                return False
+            stats.skipped += 1
+            return True
+
+    def record(self, domain, tier, success, latency):
+        with self._lock:
+            stats = self._tier(domain, tier)
+            stats.attempts += 1
+            stats.outcomes.append(1 if success else 0)
+            stats.latencies.append(latency)
+
+    def record_coupon_check(self, pid, found):
+        """Remember what a browser check found for a product's coupon"""
+        with self._lock:
+            if found:
+                self._no_coupon_since.pop(pid, None)
+            else:
+                self._no_coupon_since[pid] = time.time()
+
+    def coupon_recently_absent(self, pid):
+        """Whether the browser found no coupon for the product within COUPON_RECHECK_HOURS"""
+        with self._lock:
+            since = self._no_coupon_since.get(pid)
+            if since is None or time.time() - since >= self.coupon_recheck:
+                return False
+            self.coupon_skips += 1
+            return True
+
+    def get_coupon_status(self):
+        with self._lock:
+            return {
+                'recheck_hours': self.coupon_recheck / 3600,
+                'products_without_coupon': len(self._no_coupon_since),
+                'browser_checks_skipped': self.coupon_skips,
+            }
+
+    def get_status(self):
+        with self._lock:
+            status = {}
+            for (domain, tier), stats in sorted(self._stats.items()):
+                rate = stats.success_rate()
+                latencies = sorted(stats.latencies)
+                status.setdefault(domain, {})[tier] = {
+                    'attempts': stats.attempts,
+                    'skipped': stats.skipped,
+                    'success_rate': round(rate, 3) if rate is not None else None,
+                    'p50_latency_s': round(latencies[len(latencies) // 2], 3) if latencies else None,
+                }
+            return status
+
+
+# Global escalation policy instance
+escalation_policy = EscalationPolicy()
+
+
+def get_escalation_stats():
+    """Per-domain, per-tier hit rates and latency"""
+    return escalation_policy.get_status()
+
+
+def get_coupon_check_stats():
+    """Products whose coupon is taken as absent without a browser check"""
+    return escalation_policy.get_coupon_status()
@@ -0,0 +1,233 @@
+"""
+Offline extractor benchmark and regression check
+
+Runs the price/coupon extractors over a corpus of saved product pages
+(extractor_corpus/*.html.gz, labelled in extractor_corpus/labels.json) with
+every available HTML parser, and reports per extractor and parser:
+accuracy against the labels, mean parse and extract time, and peak memory.
+Nothing is fetched, so it runs fully offline.
+
+Usage:
+    python -m product_tracker.extractor_bench              # report as JSON
+    python -m product_tracker.extractor_bench --check      # exit 1 if the site pipeline misses a label
+    python -m product_tracker.extractor_bench --corpus DIR --repeat 5
+
+The bundled corpus is synthetic: real page layouts (Amazon buy box
+variants, Myntra embedded state and rendered offer block, JSON-LD / meta /
+plain-text shops) padded with the scripts, navigation and recommendation
+carousels that make real pages large. To add a real page, save it as
+<name>.html.gz and add a labels.json entry:
+
+    "<name>.html.gz": {"url": "...", "site": "amazon|myntra|generic",
+                       "tier": "http|browser", "price": 123.0, "coupon": {...}}
+
+Fields missing from a label are not checked.
+"""
+
+import io
+import os
+import gzip
+import json
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None  # lxml numbers are only reported when it is installed
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extractor_corpus')
+
+PARSERS = ['html.parser'] + (['lxml'] if lxml is not None else [])
+
+
+def _amazon_selectors(page):
+    from product_tracker.amazon import extract_amazon_price
+    return {'price': extract_amazon_price(page.soup)}
+
+
+def _myntra_dom_price(page):
+    from product_tracker.myntra import extract_myntra_price
+    return {'price': extract_myntra_price(page.soup)}
+
+
+def _myntra_state(page):
+    from product_tracker.myntra import extract_myntra_state, parse_myntra_state
+    state = extract_myntra_state(page.html)
+    return parse_myntra_state(state) if state else {'price': None, 'coupon': None}
+
+
+def _myntra_offer(page):
+    from product_tracker.myntra import parse_myntra_offer
+    return {'coupon': parse_myntra_offer(page.soup)}
+
+
+def _generic_rupee(page):
+    from product_tracker.tracker import extract_generic_rupee_price
+    return {'price': extract_generic_rupee_price(page.soup)}
+
+
+def _site_pipeline(page):
+    """What a scrape of this page produces: the site adapter, then the generic fallback.
+
+    Runs on the page as the HTTP tier would see it: body cut at the site's
+    stop markers and parsed with its tag filter.
+    """
+    from product_tracker.sites import get_site_adapter
+    from product_tracker.tracker import _extract_fields
+    fields = _extract_fields(get_site_adapter(page.url), page, last_tier=True)
+    return {'price': fields['price'], 'coupon': fields['coupon']}
+
+
+# How a page is prepared for an extractor
+PAGE_RAW = 'raw'  # No parse; the extractor reads page.html
+PAGE_FULL = 'full'  # Whole body, full parse
+PAGE_SITE = 'site'  # Body cut at the site's stop markers, parsed with its tag filter
+
+# name -> (sites it applies to or None for all, fields it produces, page mode, function(page) -> {field: value})
+EXTRACTORS = {
+    'amazon_selectors': (('amazon',), ('price',), PAGE_FULL, _amazon_selectors),
+    'myntra_dom_price': (('myntra',), ('price',), PAGE_FULL, _myntra_dom_price),
+    'myntra_state': (('myntra',), ('price', 'coupon'), PAGE_RAW, _myntra_state),
+    'myntra_offer': (('myntra',), ('coupon',), PAGE_FULL, _myntra_offer),
+    'generic_rupee': (None, ('price',), PAGE_FULL, _generic_rupee),
+    'site_pipeline': (None, ('price', 'coupon'), PAGE_SITE, _site_pipeline),
+    'site_pipeline_full': (None, ('price', 'coupon'), PAGE_FULL, _site_pipeline),
+}
+
+# The extractor whose misses fail --check
+PIPELINE_EXTRACTOR = 'site_pipeline'
+
+
+def load_corpus(directory=CORPUS_DIR):
+    """Return [(name, label, html)] for every labelled page in the corpus"""
+    with open(os.path.join(directory, 'labels.json'), 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+    corpus = []
+    for name, label in sorted(labels.items()):
+        path = os.path.join(directory, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            corpus.append((name, label, f.read()))
+    return corpus
+
+
+def _make_page(label, html, parser, mode):
+    from product_tracker.fetchers import FetchedPage, TIER_HTTP
+    from product_tracker.sites import get_site_adapter
+    from product_tracker.parsing import truncate_body
+    tier = label.get('tier', TIER_HTTP)
+    parse_only = None
+    if mode == PAGE_SITE:
+        adapter = get_site_adapter(label['url'])
+        parse_only = adapter.parse_only
+        if tier == TIER_HTTP:
+            html = truncate_body(html.encode('utf-8'), adapter.stop_markers).decode('utf-8', errors='replace')
+    page = FetchedPage(label['url'], html, tier, status_code=200, parse_only=parse_only)
+    page.parser = parser
+    return page
+
+
+def _matches(expected, got):
+    if isinstance(expected, (int, float)) and isinstance(got, (int, float)):
+        return abs(expected - got) < 0.01
+    return expected == got
+
+
+def _run_once(fn, mode, label, html, parser):
+    """Parse and extract once; returns (result, parse_s, extract_s)"""
+    page = _make_page(label, html, parser, mode)
+    started = time.perf_counter()
+    if mode != PAGE_RAW:
+        page.soup  # Parse up front so it is timed separately from extraction
+    parsed = time.perf_counter()
+    result = fn(page)
+    return result, parsed - started, time.perf_counter() - parsed
+
+
+def _peak_memory(fn, mode, label, html, parser):
+    tracemalloc.start()
+    try:
+        fn(_make_page(label, html, parser, mode))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_extractors(corpus, parsers=PARSERS, repeat=3):
+    """Accuracy, timing and peak memory per extractor and parser"""
+    from product_tracker.selector_stats import selector_stats
+    # Hits on synthetic pages must not reorder the production selectors
+    selector_stats.path = None
+
+    report = {}
+    for name, (sites, fields, mode, fn) in EXTRACTORS.items():
+        pages = [(page_name, label, html) for page_name, label, html in corpus
+                 if sites is None or label.get('site') in sites]
+        for parser in parsers:
+            checked = correct = 0
+            parse_s = extract_s = 0.0
+            peak = 0
+            misses = []
+            for page_name, label, html in pages:
+                with redirect_stdout(io.StringIO()):
+                    timings = [_run_once(fn, mode, label, html, parser) for _ in range(repeat)]
+                    peak = max(peak, _peak_memory(fn, mode, label, html, parser))
+                result = timings[0][0]
+                parse_s += min(t[1] for t in timings)
+                extract_s += min(t[2] for t in timings)
+                for field in fields:
+                    if field not in label:
+                        continue
+                    checked += 1
+                    if _matches(label[field], result.get(field)):
+                        correct += 1
+                    else:
+                        misses.append({'page': page_name, 'field': field, 'expected': label[field], 'got': result.get(field)})
+            count = len(pages) or 1
+            report.setdefault(name, {})[parser] = {
+                'pages': len(pages),
+                'checked': checked,
+                'correct': correct,
+                'accuracy': round(correct / checked, 3) if checked else None,
+                'parse_ms': round(1000 * parse_s / count, 2),
+                'extract_ms': round(1000 * extract_s / count, 2),
+                'peak_kb': round(peak / 1024, 1),
+                'misses': misses,
+            }
+    return report
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Benchmark price/coupon extractors on saved pages')
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='directory with labels.json and saved pages')
+    parser.add_argument('--parser', action='append', choices=['html.parser', 'lxml'], help='parser(s) to run (default: all installed)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per page; the fastest counts')
+    parser.add_argument('--check', action='store_true', help=f'exit 1 if {PIPELINE_EXTRACTOR} misses any label')
+    args = parser.parse_args(argv)
+
+    parsers = args.parser or PARSERS
+    if 'lxml' in parsers and lxml is None:
+        parser.error('lxml is not installed')
+    corpus = load_corpus(args.corpus)
+    report = benchmark_extractors(corpus, parsers, args.repeat)
+    print(json.dumps({
+        'corpus': {'pages': len(corpus), 'bytes': sum(len(html) for _, _, html in corpus)},
+        'parsers': parsers,
+        'extractors': report,
+    }, indent=2))
+
+    if args.check:
+        misses = [m for stats in report[PIPELINE_EXTRACTOR].values() for m in stats['misses']]
+        if misses:
+            print(f"{PIPELINE_EXTRACTOR} missed {len(misses)} label(s)", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Page fetchers for the scraping pipeline
+
+Each fetch tier (plain HTTP or headless browser) returns a FetchedPage whose
+HTML is parsed at most once and then shared by every extractor that runs
+against it.
+"""
+
+from bs4 import BeautifulSoup
+
+from product_tracker.config import (
+    RENDER_WORKER_ENABLED,
+    RENDER_WORKER_TIMEOUT,
+    BROWSER_POOL_LEASE_TIMEOUT,
+    PAGE_READY_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+)
+from product_tracker.admission import bounded, time_left, driver_watchdog
+from product_tracker.browser_pool import lease_driver
+from product_tracker.http_client import http_get
+from product_tracker.readiness import wait_until_ready
+from product_tracker.render_worker import render_page
+from product_tracker.parsing import read_body, decode_body, record_parse
+from product_tracker.selector_stats import build_probe_request, run_probes, record_probe_hits
+from product_tracker.profiles import (
+    profile_store,
+    cookie_jar,
+    cookies_from_response,
+    apply_browser_cookies,
+    read_browser_cookies,
+)
+
+# Fetch tiers, cheapest first
+TIER_HTTP = 'http'
+TIER_BROWSER = 'browser'
+
+
+class FetchedPage:
+    """A fetched document shared between the price and coupon extractors"""
+
+    def __init__(self, url, html, tier, status_code=None, headers=None, content=None, parse_only=None):
+        self.url = url
+        self.html = html or ''
+        self.tier = tier
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+        self.parse_only = parse_only  # Tag filter for the targeted parse, None for a full parse
+        self.probes = {}  # Browser selector probe results: {name: {selector, text, html}}
+        self.memo = {}  # Per-page results shared between extractors
+        self.parser = 'html.parser'
+        self._soup = None
+        self._full_soup = None
+
+    @property
+    def soup(self):
+        """Parse tree holding only what the site's extractors read (see parse_only)"""
+        if self._soup is None:
+            if self.parse_only is None:
+                return self.full_soup
+            self._soup = BeautifulSoup(self.html, self.parser, parse_only=self.parse_only)
+            record_parse(targeted=True)
+        return self._soup
+
+    @property
+    def full_soup(self):
+        """Parse tree of the whole document, for extractors that scan everything"""
+        if self._full_soup is None:
+            self._full_soup = BeautifulSoup(self.html, self.parser)
+            record_parse(targeted=False)
+        return self._full_soup
+
+    @property
+    def title(self):
+        return self.soup.title.string if self.soup.title else None
+
+
+def fetch_http(url, headers=None, stop_markers=None, parse_only=None):
+    print(f"[fetch_http] Called with: url={url}")
+    # The domain's profile cookies go out with the request; new ones are kept
+    timeout = (bounded(HTTP_CONNECT_TIMEOUT, 'connecting'), bounded(HTTP_READ_TIMEOUT, 'requesting'))
+    resp = http_get(url, headers=headers, cookies=cookie_jar(profile_store.cookies_for(url)), stream=True, timeout=timeout)
+    profile_store.update_cookies(url, cookies_from_response(resp))
+    # Stop reading once the site's fields have streamed past, or at the size cap
+    content = read_body(resp, stop_markers)
+    return FetchedPage(url, decode_body(resp, content), TIER_HTTP, resp.status_code, resp.headers, content, parse_only)
+
+
+def fetch_browser(url, ready_selectors=None, probes=None, parse_only=None):
+    """Render a URL; selector probes are evaluated in the live page in one round trip"""
+    print(f"[fetch_browser] Called with: url={url}, probes={list(probes or [])}")
+    probe_request = build_probe_request(probes or {})
+    cookies = profile_store.cookies_for(url) if profile_store.enabled else None
+    if RENDER_WORKER_ENABLED:
+        # Chrome runs in the render worker process, not in the web process
+        html, results, cookies = render_page(
+            url, ready_selectors, probe_request, cookies,
+            timeout=bounded(RENDER_WORKER_TIMEOUT, 'rendering'), deadline=time_left())
+    else:
+        # At the job deadline the watchdog quits the driver; the pool then discards it
+        with lease_driver(bounded(BROWSER_POOL_LEASE_TIMEOUT, 'leasing a browser')) as driver, driver_watchdog(driver):
+            apply_browser_cookies(driver, cookies)
+            driver.get(url)
+            wait_until_ready(driver, url, ready_selectors, timeout=bounded(PAGE_READY_TIMEOUT, 'waiting for the page'))
+            results = run_probes(driver, probe_request)
+            html = driver.page_source
+            cookies = read_browser_cookies(driver, url) if cookies is not None else []
+    profile_store.update_cookies(url, cookies)
+    page = FetchedPage(url, html, TIER_BROWSER, parse_only=parse_only)
+    page.probes = results
+    record_probe_hits(probes or {}, results)
+    return page
+
+
+def fetch_page(url, tier, ready_selectors=None, probes=None, parse_only=None, stop_markers=None):
+    """Fetch a URL with the given tier"""
+    if tier == TIER_BROWSER:
+        return fetch_browser(url, ready_selectors, probes, parse_only)
+    return fetch_http(url, stop_markers=stop_markers, parse_only=parse_only)
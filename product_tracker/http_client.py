@@ -0,0 +1,121 @@
+"""
+Pooled HTTP sessions for scraping
+
+One requests.Session per host, so repeated checks against the same few
+shops reuse keep-alive connections instead of paying a fresh TCP + TLS
+handshake every time. Sessions carry default timeouts, a retry/backoff
+policy for connection errors, 429 and 5xx responses, and advertise
+gzip (and brotli when the brotli package is installed).
+"""
+
+import threading
+import logging
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from product_tracker.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    PROFILES_ENABLED,
+)
+from product_tracker.urls import get_domain
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes 'br' when this is importable)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class _NoStoreCookiePolicy(DefaultCookiePolicy):
+    """Keeps cookies out of the shared session; they live in the domain profile"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+class HttpClient:
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.requests_by_host = {}
+
+    def _build_session(self):
+        retry = Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        if PROFILES_ENABLED:
+            session.cookies.set_policy(_NoStoreCookiePolicy())
+        return session
+
+    def get_session(self, url):
+        """Return the shared session for the URL's host, creating it on first use"""
+        host = get_domain(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._build_session()
+                self._sessions[host] = session
+                logger.info(f"🔗 Created HTTP session for {host}")
+            self.requests_by_host[host] = self.requests_by_host.get(host, 0) + 1
+            return session
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        return self.get_session(url).get(url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'hosts': sorted(self._sessions),
+                'requests_by_host': dict(self.requests_by_host),
+                'accept_encoding': ACCEPT_ENCODING,
+                'timeout': [HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT],
+                'retries': HTTP_RETRIES,
+            }
+
+
+# Global HTTP client instance
+http_client = HttpClient()
+
+
+def http_get(url, **kwargs):
+    """GET a URL through the pooled per-host session"""
+    return http_client.get(url, **kwargs)
+
+
+def get_http_client_status():
+    """Get HTTP session pool status"""
+    return http_client.get_status()
@@ -0,0 +1,87 @@
+"""
+Canonical product identity
+
+Product URLs arrive with tracking query strings, ref tags and SEO slugs,
+so the same product is stored under many different strings. product_id()
+reduces a URL to a stable key:
+
+    <amazon host>:<ASIN> e.g. amazon.in:B0CHX1W1XY (ASINs are per marketplace)
+    myntra:<style id>    e.g. myntra:24610494
+    url:<normalized>     any other site, tracking parameters removed
+
+Scraping, caching, coalescing and history all key off this ID.
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from product_tracker.urls import get_domain
+
+_ASIN_RE = re.compile(r'/(?:dp|gp/product|gp/aw/d|exec/obidos/asin|o/ASIN)/([A-Z0-9]{10})(?:[/?]|$)', re.IGNORECASE)
+_MYNTRA_STYLE_RE = re.compile(r'/(\d{5,})(?:/buy)?/?$')
+
+# Query parameters that never change which product a page shows
+_TRACKING_PARAMS = {
+    'ref', 'ref_', 'tag', 'linkcode', 'linkid', 'camp', 'creative', 'creativeasin',
+    'pd_rd_w', 'pd_rd_r', 'pd_rd_wg', 'pd_rd_i', 'pf_rd_p', 'pf_rd_r', 'psc', 'th',
+    'smid', 'spla', 'sprefix', 'crid', 'dib', 'dib_tag', 'qid', 'sr', 'keywords',
+    'content-id', 'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'src', 'source',
+}
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in _TRACKING_PARAMS or name.startswith('utm_')
+
+
+def normalize_url(url):
+    """Lower-case scheme/host, drop 'www.', fragment, tracking parameters and trailing slash"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k))
+    path = re.sub(r'/ref=[^/]*$', '', parts.path).rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'https', host, path, urlencode(query), ''))
+
+
+def amazon_asin(url):
+    match = _ASIN_RE.search(urlsplit(url).path + '/')
+    return match.group(1).upper() if match else None
+
+
+def myntra_style_id(url):
+    match = _MYNTRA_STYLE_RE.search(urlsplit(url).path)
+    return match.group(1) if match else None
+
+
+def product_id(url):
+    """Stable identity for the product a URL points at"""
+    domain = get_domain(url)
+    if domain.startswith('amazon.'):
+        asin = amazon_asin(url)
+        if asin:
+            return f"{domain}:{asin}"
+    elif domain.startswith('myntra.'):
+        style_id = myntra_style_id(url)
+        if style_id:
+            return f"myntra:{style_id}"
+    return f"url:{normalize_url(url)}"
+
+
+def build_product_index(products):
+    """Map product_id -> indexes into the scheduled products list"""
+    index = {}
+    for idx, item in enumerate(products):
+        index.setdefault(item['product_id'], []).append(idx)
+    return index
+
+
+def get_product_index_status(products):
+    """Summary of distinct products vs. schedules for debug pages"""
+    index = build_product_index(products)
+    return {
+        'schedules': len(products),
+        'distinct_products': len(index),
+        'products': {pid: len(idxs) for pid, idxs in index.items()},
+    }
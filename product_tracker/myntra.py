@@ -1,4 +1,6 @@
 import re
+import json
+from bs4 import BeautifulSoup
 
 def extract_myntra_price(soup):
     print(f"[extract_myntra_price] Called with: soup=<BeautifulSoup object>")
@@ -27,63 +29,156 @@ def extract_myntra_price(soup):
 
 
 
+_STATE_RE = re.compile(r'window\.__myx\s*=\s*')
+
+def extract_myntra_state(html):
+    """Return the product state JSON Myntra embeds as window.__myx, or None"""
+    print(f"[extract_myntra_state] Called with: html=<{len(html or '')} chars>")
+    match = _STATE_RE.search(html or '')
+    if not match:
+        print(f"[extract_myntra_state] Returning: None (no embedded state)")
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError as e:
+        print(f"[extract_myntra_state] Returning: None (invalid JSON: {e})")
+        return None
+    print(f"[extract_myntra_state] Returning: <state with keys {list(state)[:5]}>")
+    return state
+
+# pdpData keys that hold the product's offers, and the coupon fields of one offer
+_OFFER_KEYS = ('offers', 'couponOffers', 'offerData')
+_COUPON_FIELDS = {
+    'best_price': ('bestPrice', 'best_price', 'couponDiscountedPrice'),
+    'applicable_on': ('applicableOn', 'applicable_on'),
+    'coupon_code': ('couponCode', 'coupon_code'),
+    'coupon_discount': ('couponDiscount', 'coupon_discount'),
+}
+
+def _find_offers(pdp):
+    """The offers value of pdpData (top level, then one level down), or None when absent"""
+    for holder in [pdp] + [v for v in pdp.values() if isinstance(v, dict)]:
+        for key in _OFFER_KEYS:
+            if key in holder:
+                return holder[key]
+    return None
+
+def _first_field(offer, keys):
+    for key in keys:
+        if offer.get(key) not in (None, ''):
+            return offer[key]
+    return None
+
+def _coupon_from_offers(offers):
+    """Coupon fields read from the first offer that has any, all from that one offer"""
+    offers = [offers] if isinstance(offers, dict) else offers if isinstance(offers, list) else []
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        coupon_info = {}
+        for field, keys in _COUPON_FIELDS.items():
+            value = _first_field(offer, keys)
+            if value is not None:
+                coupon_info[field] = str(value)
+        if coupon_info:
+            if 'best_price' in coupon_info:
+                coupon_info['best_price'] = coupon_info['best_price'].replace("Rs. ", "").replace("Rs.", "")
+            return coupon_info
+    return {}
+
+_NUMBER_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+def _to_price(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value)
+        return float(match.group(0).replace(',', '')) if match else None
+    return None
+
+def parse_myntra_state(state):
+    """Pull price and coupon details out of Myntra's embedded pdpData.
+
+    Returns {'price': float or None, 'coupon': dict or None}. The coupon dict
+    has the same keys as parse_myntra_offer(), all taken from a single
+    offer; it is empty when the state lists no coupon offer, and None when
+    the state carries no offers at all (they may still render client-side).
+    """
+    print(f"[parse_myntra_state] Called with: state=<dict>")
+    pdp = state.get('pdpData') if isinstance(state, dict) else None
+    if not isinstance(pdp, dict):
+        print(f"[parse_myntra_state] Returning: no pdpData")
+        return {'price': None, 'coupon': None}
+
+    price_info = pdp.get('price') if isinstance(pdp.get('price'), dict) else {}
+    price = _to_price(price_info.get('discounted')) or _to_price(price_info.get('mrp'))
+
+    # Offers present (even an empty list) settle the coupon; without them it is unknown
+    offers = _find_offers(pdp)
+    coupon_info = None if offers is None else _coupon_from_offers(offers)
+
+    result = {'price': price, 'coupon': coupon_info}
+    print(f"[parse_myntra_state] Returning: {result}")
+    return result
+
+
+
+def parse_myntra_offer(soup):
+    print(f"[parse_myntra_offer] Called with: soup=<BeautifulSoup object>")
+    coupon_info = {}
+    offer = soup.find("div", class_="pdp-offers-offer")
+    
+    if offer:
+        price_span = offer.find("span", class_="pdp-offers-price")
+        if price_span:
+            coupon_info["best_price"] = price_span.get_text(strip=True).replace("Rs. ", "").replace("Rs.", "")
+        desc_items = offer.find_all("div", class_="pdp-offers-labelMarkup")
+        for item in desc_items:
+            text = item.get_text(" ", strip=True)
+            if "Applicable on:" in text:
+                span = item.find("span")
+                if span:
+                    coupon_info["applicable_on"] = span.get_text(strip=True)
+            elif "Coupon code:" in text:
+                span = item.find("span", class_="pdp-offers-boldText")
+                if span:
+                    coupon_info["coupon_code"] = span.get_text(strip=True)
+            elif "Coupon Discount:" in text:
+                span = item.find("span")
+                if span:
+                    coupon_info["coupon_discount"] = span.get_text(strip=True)
+    print(f"[parse_myntra_offer] Returning: {coupon_info}")
+    return coupon_info
+
+
+
+# Offer block HTML is pulled out of the live page by a browser selector probe
+MYNTRA_OFFER_PROBES = {'offer': {'group': 'myntra.offer', 'selectors': ['div.pdp-offers-offer'], 'html': True}}
+
+
+def parse_myntra_offer_page(page):
+    """Coupon info from the offer probe fragment when present, otherwise from the parsed page"""
+    probe = page.probes.get('offer')
+    if probe and probe.get('html'):
+        return parse_myntra_offer(BeautifulSoup(probe['html'], 'html.parser'))
+    return parse_myntra_offer(page.soup)
+
+
+
 def extract_myntra_coupon(url):
     print(f"[extract_myntra_coupon] Called with: url={url}")
+    coupon_info = {}
     try:
-        coupon_info = {}  # Initialize coupon_info as an empty dictionary
         if not url:
             print('Selenium fallback: No URL provided, cannot proceed.')
             print(f"[extract_myntra_coupon] Returning: {coupon_info}")
             return coupon_info
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
-        from bs4 import BeautifulSoup
-        import time
-        
-        
-        CHROMEDRIVER_PATH = 'chromedriver-win64/chromedriver.exe'
-        options = Options()
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--lang=en-US')
-        service = Service(CHROMEDRIVER_PATH)
-        driver = webdriver.Chrome(service=service, options=options)
-        
-        driver.get(url)
-        
-        time.sleep(3)
-        html = driver.page_source
-        
-        driver.quit()
-        
-        soup2 = BeautifulSoup(html, "html.parser")
-        
-        offer = soup2.find("div", class_="pdp-offers-offer")
-        
-        if offer:
-            price_span = offer.find("span", class_="pdp-offers-price")
-            if price_span:
-                coupon_info["best_price"] = price_span.get_text(strip=True).replace("Rs. ", "").replace("Rs.", "")
-            desc_items = offer.find_all("div", class_="pdp-offers-labelMarkup")
-            for item in desc_items:
-                text = item.get_text(" ", strip=True)
-                if "Applicable on:" in text:
-                    span = item.find("span")
-                    if span:
-                        coupon_info["applicable_on"] = span.get_text(strip=True)
-                elif "Coupon code:" in text:
-                    span = item.find("span", class_="pdp-offers-boldText")
-                    if span:
-                        coupon_info["coupon_code"] = span.get_text(strip=True)
-                elif "Coupon Discount:" in text:
-                    span = item.find("span")
-                    if span:
-                        coupon_info["coupon_discount"] = span.get_text(strip=True)
-            print(f"[extract_myntra_coupon] Returning: {coupon_info}")
-            return coupon_info
+        from product_tracker.fetchers import fetch_browser
+        page = fetch_browser(url, probes=MYNTRA_OFFER_PROBES)
+        coupon_info = parse_myntra_offer_page(page)
         print(f"[extract_myntra_coupon] Returning: {coupon_info}")
         return coupon_info
     except Exception as e:
         print(f"Selenium fallback failed: {e}")
         print(f"[extract_myntra_coupon] Returning: {coupon_info}")
-        return coupon_info
\ No newline at end of file
+        return coupon_info
@@ -0,0 +1,144 @@
+"""
+Bounded reading and targeted parsing of product pages
+
+Product pages run to megabytes of inline scripts, navigation and
+recommendation carousels, while the extractors need a handful of elements.
+Two things keep a check cheap:
+
+- The HTTP body is streamed and reading stops once a site's stop markers
+  have all been seen (plus HTTP_STOP_MARGIN bytes), or at HTTP_MAX_BODY_BYTES.
+  The cut point depends only on the content, so an unchanged page still
+  hashes the same for the response cache.
+- Site adapters declare which tags their extractors read; the page is parsed
+  with a filter that only builds those tags (and their contents) into the
+  tree. A full parse is only made for the generic fallback.
+"""
+
+import threading
+
+from bs4 import SoupStrainer
+
+from product_tracker.config import HTTP_MAX_BODY_BYTES, HTTP_STOP_MARGIN
+from product_tracker.admission import check_deadline
+
+_CHUNK_SIZE = 16384
+_OVERLAP = 256  # Bytes re-scanned so a marker split across chunks is still found
+
+_stats = {
+    'responses': 0,
+    'stopped_early': 0,
+    'capped': 0,
+    'bytes_read': 0,
+    'targeted_parses': 0,
+    'full_parses': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def record_parse(targeted):
+    with _stats_lock:
+        _stats['targeted_parses' if targeted else 'full_parses'] += 1
+
+
+def get_parse_stats():
+    """Body reads stopped early / capped and targeted vs full parses"""
+    with _stats_lock:
+        return dict(_stats)
+
+
+class TagFilter(SoupStrainer):
+    """Builds only tags accepted by predicate(name, attrs) (with everything inside them).
+
+    Implements the parse-time hooks of both bs4 4.12 (search_tag) and
+    4.13+ (allow_tag_creation).
+    """
+
+    def __init__(self, predicate):
+        super().__init__()
+        self.predicate = predicate
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.predicate(name, attrs or {})
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return self.predicate(markup_name, markup_attrs or {})
+
+
+def tag_classes(attrs):
+    """Class names of a raw attribute dict seen during parsing"""
+    value = attrs.get('class') or ''
+    return value.split() if isinstance(value, str) else list(value)
+
+
+class StopScanner:
+    """Finds where a body can be cut: STOP_MARGIN bytes past the last of a sequence of markers"""
+
+    def __init__(self, markers, margin=HTTP_STOP_MARGIN):
+        self.markers = list(markers or [])
+        self.margin = margin
+        self._next = 0
+        self._pos = 0
+        self._scanned = 0
+        self.cut = None
+
+    def feed(self, data):
+        """Scan the body read so far; returns the cut offset once every marker was found"""
+        while self.cut is None and self._next < len(self.markers):
+            start = max(self._pos, self._scanned - _OVERLAP)
+            match = self.markers[self._next].search(data, start)
+            if not match:
+                break
+            self._pos = match.end()
+            self._next += 1
+        self._scanned = len(data)
+        if self.cut is None and self.markers and self._next == len(self.markers):
+            self.cut = self._pos + self.margin
+        return self.cut
+
+
+def read_body(resp, stop_markers=None, max_bytes=HTTP_MAX_BODY_BYTES):
+    """Read a streamed response body, stopping early at the stop markers or the size cap"""
+    scanner = StopScanner(stop_markers)
+    buf = bytearray()
+    reason = None
+    try:
+        for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+            # A server dripping bytes would otherwise hold the thread past the job deadline
+            check_deadline('the body was read')
+            buf += chunk
+            cut = scanner.feed(buf)
+            if cut is not None and len(buf) >= cut:
+                del buf[cut:]
+                reason = 'stopped_early'
+                break
+            if max_bytes and len(buf) >= max_bytes:
+                del buf[max_bytes:]
+                reason = 'capped'
+                break
+    finally:
+        # An unread body cannot go back to the keep-alive pool; close drops it
+        resp.close()
+    with _stats_lock:
+        _stats['responses'] += 1
+        _stats['bytes_read'] += len(buf)
+        if reason:
+            _stats[reason] += 1
+    return bytes(buf)
+
+
+def truncate_body(content, stop_markers=None, max_bytes=HTTP_MAX_BODY_BYTES):
+    """Apply the same cut as read_body to a body that is already in memory"""
+    cut = StopScanner(stop_markers).feed(content)
+    if cut is not None:
+        content = content[:cut]
+    return content[:max_bytes] if max_bytes else content
+
+
+def decode_body(resp, content):
+    """Text of a body read with read_body; UTF-8 unless the server names a charset"""
+    content_type = resp.headers.get('Content-Type', '').lower()
+    encoding = resp.encoding if 'charset' in content_type and resp.encoding else 'utf-8'
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
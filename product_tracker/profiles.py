@@ -0,0 +1,294 @@
+"""
+Persistent per-domain scraping profiles
+
+Every scrape used to start from a blank browser, so shops showed consent and
+location interstitials and bot checks more often. A profile is the cookie
+jar for one domain, persisted in PROFILE_DIR and shared by the HTTP sessions
+and the pooled browsers: cookies are injected before a fetch and whatever
+the site sets is merged back afterwards.
+
+Profiles are rotated (replaced by an empty one) when they get older than
+PROFILE_MAX_AGE_HOURS or hit PROFILE_ROTATE_AFTER_BLOCKS bot walls in a row.
+Success rate and average latency are tracked per profile. Cookie and stat
+updates only mark a profile dirty; dirty profiles are written at most every
+save_interval seconds and at exit.
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import threading
+import logging
+from collections import deque
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from product_tracker.config import (
+    PROFILES_ENABLED,
+    PROFILE_DIR,
+    PROFILE_MAX_AGE_HOURS,
+    PROFILE_ROTATE_AFTER_BLOCKS,
+)
+from product_tracker.urls import get_domain
+
+logger = logging.getLogger(__name__)
+
+
+def _cookie_matches(cookie, domain):
+    cookie_domain = (cookie.get('domain') or '').lstrip('.')
+    return cookie_domain == domain or cookie_domain.endswith('.' + domain)
+
+
+def _is_expired(cookie, now):
+    expires = cookie.get('expires')
+    return expires is not None and expires <= now
+
+
+def _new_profile(domain):
+    return {
+        'id': f"{domain}-{uuid.uuid4().hex[:8]}",
+        'domain': domain,
+        'created_at': time.time(),
+        'cookies': [],
+        'stats': {'attempts': 0, 'successes': 0, 'total_latency': 0.0, 'blocks': 0, 'consecutive_blocks': 0},
+    }
+
+
+def _summary(profile):
+    stats = profile['stats']
+    attempts = stats['attempts']
+    return {
+        'id': profile['id'],
+        'age_hours': round((time.time() - profile['created_at']) / 3600, 1),
+        'cookies': len(profile['cookies']),
+        'attempts': attempts,
+        'success_rate': round(stats['successes'] / attempts, 3) if attempts else None,
+        'avg_latency_s': round(stats['total_latency'] / attempts, 3) if attempts else None,
+        'blocks': stats['blocks'],
+    }
+
+
+class ProfileStore:
+    def __init__(self, directory=PROFILE_DIR, enabled=PROFILES_ENABLED,
+                 max_age_hours=PROFILE_MAX_AGE_HOURS, rotate_after_blocks=PROFILE_ROTATE_AFTER_BLOCKS,
+                 save_interval=60):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_age_hours = max_age_hours
+        self.rotate_after_blocks = rotate_after_blocks
+        self.save_interval = save_interval
+        self._profiles = {}
+        self._dirty = set()  # Domains whose profile changed since it was written
+        self._last_save = time.monotonic()
+        self._retired = deque(maxlen=20)  # Summaries of rotated profiles for the debug pages
+        self._lock = threading.Lock()
+        self.rotations = 0
+
+    def _path(self, domain):
+        return os.path.join(self.directory, f"{domain}.json")
+
+    def _load(self, domain):
+        try:
+            with open(self._path(domain), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable profile for {domain}: {e}")
+            return None
+
+    def _write(self, domain, data):
+        path = self._path(domain)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save profile for {domain}: {e}")
+
+    def _save(self, profile):
+        self._dirty.discard(profile['domain'])
+        self._write(profile['domain'], json.dumps(profile))
+
+    def _mark_dirty(self, domain):
+        """Flag a profile for the next save; called with the lock held. Returns whether a save is due"""
+        self._dirty.add(domain)
+        return time.monotonic() - self._last_save >= self.save_interval
+
+    def save(self):
+        """Write every dirty profile"""
+        with self._lock:
+            pending = [(domain, json.dumps(self._profiles[domain])) for domain in self._dirty if domain in self._profiles]
+            self._dirty.clear()
+            self._last_save = time.monotonic()
+        for domain, data in pending:
+            self._write(domain, data)
+
+    def _rotate(self, domain, reason):
+        old = self._profiles.get(domain)
+        if old is not None:
+            self._retired.append(dict(_summary(old), domain=domain, retired_because=reason))
+            self.rotations += 1
+        profile = _new_profile(domain)
+        self._profiles[domain] = profile
+        logger.info(f"🔄 New scraping profile for {domain} ({reason})")
+        self._save(profile)
+        return profile
+
+    def _profile(self, domain):
+        """Current profile for a domain; called with the lock held"""
+        profile = self._profiles.get(domain)
+        if profile is None:
+            profile = self._load(domain)
+            if profile is None:
+                return self._rotate(domain, 'created')
+            self._profiles[domain] = profile
+        if self.max_age_hours and time.time() - profile['created_at'] > self.max_age_hours * 3600:
+            return self._rotate(domain, 'expired')
+        return profile
+
+    def cookies_for(self, url):
+        """Unexpired cookies of the URL's domain profile"""
+        if not self.enabled:
+            return []
+        domain = get_domain(url)
+        now = time.time()
+        with self._lock:
+            return [dict(c) for c in self._profile(domain)['cookies'] if not _is_expired(c, now)]
+
+    def update_cookies(self, url, cookies):
+        """Merge cookies a site set during a fetch into its profile"""
+        if not self.enabled or not cookies:
+            return
+        domain = get_domain(url)
+        now = time.time()
+        with self._lock:
+            profile = self._profile(domain)
+            merged = {(c['name'], c['domain'], c['path']): c for c in profile['cookies']}
+            for cookie in cookies:
+                if _cookie_matches(cookie, domain):
+                    merged[(cookie['name'], cookie['domain'], cookie['path'])] = cookie
+            profile['cookies'] = [c for c in merged.values() if not _is_expired(c, now)]
+            due = self._mark_dirty(domain)
+        if due:
+            self.save()
+
+    def record(self, url, success, latency, blocked=False):
+        """Record a fetch made with the domain's current profile"""
+        if not self.enabled:
+            return
+        domain = get_domain(url)
+        with self._lock:
+            profile = self._profile(domain)
+            stats = profile['stats']
+            stats['attempts'] += 1
+            stats['successes'] += 1 if success else 0
+            stats['total_latency'] += latency
+            if blocked:
+                stats['blocks'] += 1
+                stats['consecutive_blocks'] += 1
+            else:
+                stats['consecutive_blocks'] = 0
+            if self.rotate_after_blocks and stats['consecutive_blocks'] >= self.rotate_after_blocks:
+                self._rotate(domain, f"{stats['consecutive_blocks']} bot walls in a row")
+                due = False
+            else:
+                due = self._mark_dirty(domain)
+        if due:
+            self.save()
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'max_age_hours': self.max_age_hours,
+                'rotate_after_blocks': self.rotate_after_blocks,
+                'rotations': self.rotations,
+                'active': {domain: _summary(p) for domain, p in sorted(self._profiles.items())},
+                'retired': list(self._retired),
+            }
+
+
+# Global profile store instance
+profile_store = ProfileStore()
+atexit.register(profile_store.save)
+
+
+# --- Cookie conversion for the HTTP and browser tiers ---
+
+def cookie_jar(cookies):
+    """requests cookie jar for a request made with a profile"""
+    jar = RequestsCookieJar()
+    for c in cookies:
+        jar.set_cookie(create_cookie(
+            c['name'], c['value'], domain=c['domain'], path=c['path'],
+            expires=c.get('expires'), secure=c.get('secure', False),
+            rest={'HttpOnly': None} if c.get('httpOnly') else {},
+        ))
+    return jar
+
+
+def cookies_from_response(resp):
+    """Cookies set by a response and any redirects before it"""
+    cookies = []
+    for r in list(resp.history) + [resp]:
+        for c in r.cookies:
+            cookies.append({
+                'name': c.name,
+                'value': c.value,
+                'domain': c.domain,
+                'path': c.path,
+                'expires': c.expires,
+                'secure': bool(c.secure),
+                'httpOnly': c.has_nonstandard_attr('HttpOnly'),
+            })
+    return cookies
+
+
+def apply_browser_cookies(driver, cookies):
+    """Load profile cookies into a browser before navigating (no page load needed via CDP)"""
+    if not cookies:
+        return
+    params = []
+    for c in cookies:
+        cookie = {k: c[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly') if k in c}
+        if c.get('expires') is not None:
+            cookie['expires'] = c['expires']
+        params.append(cookie)
+    try:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load profile cookies into browser: {e}")
+
+
+def read_browser_cookies(driver, url):
+    """Cookies the browser holds for the URL's domain"""
+    domain = get_domain(url)
+    try:
+        result = driver.execute_cdp_cmd('Network.getAllCookies', {})
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read browser cookies: {e}")
+        return []
+    cookies = []
+    for c in result.get('cookies', []):
+        if not _cookie_matches(c, domain):
+            continue
+        cookies.append({
+            'name': c['name'],
+            'value': c['value'],
+            'domain': c['domain'],
+            'path': c.get('path', '/'),
+            'expires': None if c.get('session') or c.get('expires', -1) < 0 else c['expires'],
+            'secure': c.get('secure', False),
+            'httpOnly': c.get('httpOnly', False),
+        })
+    return cookies
+
+
+def get_profile_status():
+    """Per-domain profile age, cookie count, success rate and latency"""
+    return profile_store.get_status()
@@ -0,0 +1,240 @@
+"""
+Per-domain rate limiting and circuit breaking for scraping
+
+Every page fetch takes a token from its domain's bucket, so bursts (several
+cron hours lining up, trigger-all) are spread out instead of getting the
+whole batch throttled. A caller that would have to queue longer than
+RATE_LIMIT_MAX_WAIT fails fast instead.
+
+A circuit breaker per domain opens after BREAKER_FAILURE_THRESHOLD
+consecutive failed fetches or bot walls. While open, scrapes for that
+domain short-circuit without loading anything; after the cooldown a single
+trial fetch is let through. A failed trial reopens the breaker with the
+cooldown doubled (up to BREAKER_MAX_COOLDOWN), a successful one closes it.
+Only outcomes the site is responsible for count; a fetch that fails locally
+(no free browser, render worker down, job deadline) is released instead.
+"""
+
+import time
+import threading
+import logging
+
+import requests
+
+from product_tracker.config import (
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_WAIT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+)
+from product_tracker.admission import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of fetching while a domain's breaker is open"""
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a fetch would have to queue longer than the allowed wait"""
+
+
+def is_site_failure(error):
+    """Whether a fetch error is the site's doing rather than this process's.
+
+    HTTP and connection errors are; a busy browser pool, a dead render worker
+    or the job's deadline say nothing about the site. Browser navigation
+    errors only arrive as text (from the render worker), hence 'net::ERR_'.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, requests.RequestException):
+        return True
+    return 'net::ERR_' in str(error)
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def reserve(self, max_wait):
+        """Take a token; return seconds to wait before using it, or None if that exceeds max_wait"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return None
+        # Tokens may go negative: each queued caller reserves the next free slot
+        wait = (1 - self.tokens) / self.rate
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+
+class CircuitBreaker:
+    def __init__(self, threshold, cooldown, max_cooldown):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.last_failure = None
+        self.opened = 0
+        self.short_circuited = 0
+
+    def allow(self):
+        """Whether a fetch may go ahead now"""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and time.monotonic() >= self.open_until:
+            self.state = STATE_HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == STATE_HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self.open_until = time.monotonic() + self.cooldown
+        self.trial_in_flight = False
+        self.opened += 1
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != STATE_CLOSED:
+            self.state = STATE_CLOSED
+            self.cooldown = self.base_cooldown
+            self.trial_in_flight = False
+            return True
+        return False
+
+    def record_failure(self, reason):
+        self.failures += 1
+        self.last_failure = reason
+        if self.state == STATE_HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+            return True
+        if self.state == STATE_CLOSED and self.threshold and self.failures >= self.threshold:
+            self._open()
+            return True
+        return False
+
+    def retry_in(self):
+        return max(0.0, self.open_until - time.monotonic()) if self.state == STATE_OPEN else 0.0
+
+
+class DomainGuard:
+    def __init__(self, rate_per_minute=RATE_LIMIT_PER_MINUTE, burst=RATE_LIMIT_BURST, max_wait=RATE_LIMIT_MAX_WAIT,
+                 threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.max_wait = max_wait
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._buckets = {}
+        self._breakers = {}
+        self._waits = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, domain):
+        if domain not in self._breakers:
+            self._breakers[domain] = CircuitBreaker(self.threshold, self.cooldown, self.max_cooldown)
+        return self._breakers[domain]
+
+    def _bucket(self, domain):
+        if domain not in self._buckets:
+            self._buckets[domain] = TokenBucket(self.rate_per_minute, self.burst)
+        return self._buckets[domain]
+
+    def acquire(self, domain, max_wait=None):
+        """Wait for the domain's rate limit; raise instead when the breaker is open or the queue is too long.
+
+        max_wait, when given, shortens the longest acceptable queue (e.g. to a job's time left).
+        """
+        max_wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        with self._lock:
+            breaker = self._breaker(domain)
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"{domain} circuit open after {breaker.failures} failures "
+                    f"({breaker.last_failure}); retry in {breaker.retry_in():.0f}s")
+            wait = self._bucket(domain).reserve(max_wait) if self.rate_per_minute else 0.0
+            if wait is None:
+                if breaker.state == STATE_HALF_OPEN:
+                    breaker.trial_in_flight = False
+                raise RateLimitExceeded(f"{domain} rate limit queue longer than {max_wait:.0f}s")
+            stats = self._waits.setdefault(domain, {'fetches': 0, 'waited': 0, 'total_wait': 0.0})
+            stats['fetches'] += 1
+            if wait > 0:
+                stats['waited'] += 1
+                stats['total_wait'] += wait
+        if wait > 0:
+            print(f"[domain_guard] Waiting {wait:.1f}s for {domain} rate limit")
+            time.sleep(wait)
+
+    def release(self, domain):
+        """Give back a half-open trial whose fetch never reached the site, recording no outcome"""
+        with self._lock:
+            breaker = self._breaker(domain)
+            if breaker.state == STATE_HALF_OPEN:
+                breaker.trial_in_flight = False
+
+    def record(self, domain, success, reason=None):
+        """Feed a fetch outcome (failure = error or bot wall) into the domain's breaker"""
+        with self._lock:
+            breaker = self._breaker(domain)
+            if success:
+                if breaker.record_success():
+                    logger.info(f"✅ Circuit for {domain} closed")
+            elif breaker.record_failure(reason):
+                logger.warning(f"⛔ Circuit for {domain} opened for {breaker.cooldown:.0f}s ({reason})")
+
+    def get_status(self):
+        with self._lock:
+            status = {}
+            for domain in sorted(set(self._breakers) | set(self._waits)):
+                breaker = self._breaker(domain)
+                waits = self._waits.get(domain, {'fetches': 0, 'waited': 0, 'total_wait': 0.0})
+                status[domain] = {
+                    'state': breaker.state,
+                    'consecutive_failures': breaker.failures,
+                    'last_failure': breaker.last_failure,
+                    'retry_in_s': round(breaker.retry_in(), 1),
+                    'cooldown_s': breaker.cooldown,
+                    'times_opened': breaker.opened,
+                    'short_circuited': breaker.short_circuited,
+                    'fetches': waits['fetches'],
+                    'throttled': waits['waited'],
+                    'total_wait_s': round(waits['total_wait'], 1),
+                }
+            return status
+
+
+# Global per-domain guard instance
+domain_guard = DomainGuard()
+
+
+def get_domain_guard_status():
+    """Per-domain breaker state and rate limit waits"""
+    return domain_guard.get_status()
@@ -0,0 +1,154 @@
+"""
+Condition-based page readiness for Selenium scraping
+
+Instead of sleeping a fixed 3 seconds after driver.get(), wait until any of
+the site's known price/offer selectors is present in the DOM, bounded by an
+overall deadline. Sites whose data renders in stages (Myntra draws the
+offer block after the price) also name the late selectors, which get a
+short grace period once the page is ready. Time-to-ready is recorded per
+domain.
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from product_tracker.config import PAGE_READY_TIMEOUT, PAGE_READY_GRACE
+from product_tracker.urls import get_domain
+
+logger = logging.getLogger(__name__)
+
+# CSS selectors that signal "the data we scrape has rendered", keyed by the
+# same site markers the tracker uses to pick extraction logic
+SITE_READY_SELECTORS = {
+    'amazon.': [
+        '#priceblock_ourprice',
+        '#priceblock_dealprice',
+        '#priceblock_saleprice',
+        'span.a-price > span.a-offscreen',
+        'span.a-price-whole',
+    ],
+    'myntra.': [
+        'div.pdp-offers-offer',
+        'span.pdp-price',
+    ],
+}
+
+# Selectors that render after the page counts as ready; waited for up to
+# PAGE_READY_GRACE seconds since products without an offer never show them
+SITE_LATE_SELECTORS = {
+    'myntra.': [
+        'div.pdp-offers-offer',
+    ],
+}
+
+_ANY_SELECTOR_JS = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    if (document.querySelector(selectors[i])) { return true; }
+}
+return false;
+"""
+
+_DOCUMENT_COMPLETE_JS = "return document.readyState === 'complete';"
+
+
+def get_ready_selectors(url):
+    """Return the readiness selectors for a URL, or an empty list for unknown sites"""
+    for marker, selectors in SITE_READY_SELECTORS.items():
+        if marker in url:
+            return selectors
+    return []
+
+
+def get_late_selectors(url):
+    """Return the selectors worth a grace wait after readiness, or an empty list"""
+    for marker, selectors in SITE_LATE_SELECTORS.items():
+        if marker in url:
+            return selectors
+    return []
+
+
+class ReadinessStats:
+    """Rolling per-domain time-to-ready samples"""
+
+    def __init__(self, max_samples=200):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._timeouts = {}
+        self._lock = threading.Lock()
+
+    def record(self, domain, seconds, ready):
+        with self._lock:
+            self._samples.setdefault(domain, deque(maxlen=self.max_samples)).append(seconds)
+            if not ready:
+                self._timeouts[domain] = self._timeouts.get(domain, 0) + 1
+
+    def get_status(self):
+        with self._lock:
+            status = {}
+            for domain, samples in self._samples.items():
+                ordered = sorted(samples)
+                count = len(ordered)
+                status[domain] = {
+                    'samples': count,
+                    'p50_s': round(ordered[count // 2], 3),
+                    'p90_s': round(ordered[min(count - 1, int(count * 0.9))], 3),
+                    'max_s': round(ordered[-1], 3),
+                    'timeouts': self._timeouts.get(domain, 0),
+                }
+            return status
+
+
+# Global readiness stats instance
+readiness_stats = ReadinessStats()
+
+
+def wait_until_ready(driver, url, selectors=None, timeout=PAGE_READY_TIMEOUT):
+    """Block until one of the selectors is present or the deadline passes.
+
+    Call right after driver.get(url). Returns True when the page became ready
+    and False on timeout; callers still try to extract from whatever rendered.
+    Sites without known selectors wait for document.readyState == 'complete'.
+    """
+    if selectors is None:
+        selectors = get_ready_selectors(url)
+    started = time.monotonic()
+    try:
+        if selectors:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_ANY_SELECTOR_JS, selectors)
+            )
+        else:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_DOCUMENT_COMPLETE_JS)
+            )
+        ready = True
+    except TimeoutException:
+        ready = False
+    late = get_late_selectors(url)
+    grace = min(PAGE_READY_GRACE, timeout - (time.monotonic() - started))
+    if ready and late and grace > 0:
+        try:
+            WebDriverWait(driver, grace, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_ANY_SELECTOR_JS, late)
+            )
+        except TimeoutException:
+            logger.info(f"⏱️ {get_domain(url)} late elements absent after {grace:.1f}s grace")
+    elapsed = time.monotonic() - started
+    domain = get_domain(url)
+    readiness_stats.record(domain, elapsed, ready)
+    if ready:
+        logger.info(f"⏱️ {domain} ready in {elapsed:.2f}s")
+    else:
+        logger.warning(f"⚠️ {domain} not ready after {timeout}s, extracting anyway")
+    return ready
+
+
+def get_readiness_stats():
+    """Get per-domain time-to-ready distribution"""
+    return readiness_stats.get_status()
@@ -0,0 +1,337 @@
+"""
+Out-of-process browser render worker
+
+Every Chrome instance lives in a separate worker process instead of the
+gunicorn/Flask process. The web process sends fetch jobs over a local,
+authenticated socket and gets rendered HTML back. The worker enforces a
+global concurrency limit and a memory budget for itself plus its browsers,
+and exits to be restarted when it has rendered RENDER_WORKER_MAX_JOBS
+pages or cannot get back under budget, so leaks never reach the web
+process.
+
+The worker is started lazily on the first browser fetch:
+    python -m product_tracker.render_worker   (spawned by RenderWorkerClient)
+"""
+
+import os
+import sys
+import time
+import atexit
+import socket
+import signal
+import threading
+import subprocess
+import logging
+from multiprocessing.connection import Listener, Client
+
+from product_tracker.config import (
+    RENDER_WORKER_CONCURRENCY,
+    RENDER_WORKER_RSS_BUDGET_MB,
+    RENDER_WORKER_MAX_JOBS,
+    RENDER_WORKER_TIMEOUT,
+    BROWSER_POOL_LEASE_TIMEOUT,
+    PAGE_READY_TIMEOUT,
+)
+from product_tracker.admission import DeadlineExceeded, job_deadline, bounded, driver_watchdog
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # The memory budget is not enforced without psutil
+
+logger = logging.getLogger(__name__)
+
+_AUTHKEY_ENV = 'RENDER_WORKER_AUTHKEY'
+_PORT_ENV = 'RENDER_WORKER_PORT'
+
+
+# --- Worker process side ---
+
+class _RenderWorker:
+    def __init__(self, concurrency, rss_budget_mb, max_jobs):
+        from product_tracker.browser_pool import DriverPool
+        self.pool = DriverPool(size=concurrency)
+        self.concurrency = concurrency
+        self.rss_budget_mb = rss_budget_mb
+        self.max_jobs = max_jobs
+        self.cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.jobs = 0
+        self.draining = False
+
+    def rss_mb(self):
+        """Memory of this process plus every browser it started"""
+        if psutil is None:
+            return None
+        root = psutil.Process(os.getpid())
+        total = 0
+        for proc in [root] + root.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+
+    def _over_budget(self):
+        if not self.rss_budget_mb:
+            return False
+        rss = self.rss_mb()
+        return rss is not None and rss >= self.rss_budget_mb
+
+    def _admit(self):
+        with self.cond:
+            self.waiting += 1
+            try:
+                # Wait for a slot; while over budget, also wait for running jobs to finish
+                while self.in_flight >= self.concurrency or (self.in_flight and self._over_budget()):
+                    self.cond.wait(bounded(1.0, 'a render slot was free'))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            idle_over_budget = self.in_flight == 1 and self._over_budget()
+        if idle_over_budget:
+            logger.info("♻️ Render worker over memory budget, recycling idle browsers")
+            self.pool.recycle_idle()
+
+    def _finish(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.jobs += 1
+            if self.max_jobs and self.jobs >= self.max_jobs:
+                self.draining = True
+            elif self.in_flight == 0 and self._over_budget():
+                self.pool.recycle_idle()
+                if self._over_budget():
+                    self.draining = True
+            exit_now = self.draining and self.in_flight == 0
+            self.cond.notify_all()
+        if exit_now:
+            self.exit(f"restarting after {self.jobs} jobs")
+
+    def exit(self, reason):
+        logger.info(f"🔌 Render worker exiting: {reason}")
+        self.pool.shutdown()
+        os._exit(0)
+
+    def render(self, url, ready_selectors, probe_request, cookies):
+        from product_tracker.readiness import wait_until_ready
+        from product_tracker.selector_stats import run_probes
+        from product_tracker.profiles import apply_browser_cookies, read_browser_cookies
+        # The caller's deadline applies here too: a hung page is quit and its driver discarded
+        with self.pool.lease(bounded(BROWSER_POOL_LEASE_TIMEOUT, 'leasing a browser')) as driver, driver_watchdog(driver):
+            apply_browser_cookies(driver, cookies)
+            driver.get(url)
+            wait_until_ready(driver, url, ready_selectors, timeout=bounded(PAGE_READY_TIMEOUT, 'waiting for the page'))
+            results = run_probes(driver, probe_request)
+            # Profile cookies go back to the web process, which owns the profiles
+            cookies = read_browser_cookies(driver, url) if cookies is not None else []
+            return driver.page_source, results, cookies
+
+    def status(self):
+        from product_tracker.readiness import get_readiness_stats
+        with self.cond:
+            rss = self.rss_mb()
+            return {
+                'pid': os.getpid(),
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'jobs': self.jobs,
+                'max_jobs': self.max_jobs,
+                'rss_mb': round(rss, 1) if rss is not None else None,
+                'rss_budget_mb': self.rss_budget_mb if psutil is not None else None,
+                'draining': self.draining,
+                'browser_pool': self.pool.get_status(),
+                'page_ready_time': get_readiness_stats(),
+            }
+
+    def handle(self, conn):
+        try:
+            request = conn.recv()
+            if request.get('op') == 'status':
+                conn.send({'ok': True, 'status': self.status()})
+                return
+            if self.draining:
+                conn.send({'ok': False, 'retry': True, 'error': 'render worker restarting'})
+                return
+            with job_deadline(request.get('deadline')):
+                try:
+                    self._admit()
+                except DeadlineExceeded as e:
+                    conn.send({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+                    return
+                try:
+                    html, probes, cookies = self.render(
+                        request['url'], request.get('ready_selectors'), request.get('probes'), request.get('cookies'))
+                    reply = {'ok': True, 'html': html, 'probes': probes, 'cookies': cookies}
+                except Exception as e:
+                    reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                try:
+                    conn.send(reply)
+                finally:
+                    self._finish()
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+
+def _watch_parent(worker, parent_pid):
+    """Exit when the web process that started this worker goes away"""
+    while True:
+        time.sleep(5)
+        if os.getppid() != parent_pid:
+            worker.exit("parent process exited")
+
+
+def worker_main():
+    logging.basicConfig(level=logging.INFO)
+    authkey = bytes.fromhex(os.environ[_AUTHKEY_ENV])
+    port = int(os.environ[_PORT_ENV])
+    worker = _RenderWorker(RENDER_WORKER_CONCURRENCY, RENDER_WORKER_RSS_BUDGET_MB, RENDER_WORKER_MAX_JOBS)
+    signal.signal(signal.SIGTERM, lambda *args: worker.exit("SIGTERM"))
+    threading.Thread(target=_watch_parent, args=(worker, os.getppid()), daemon=True).start()
+
+    listener = Listener(('127.0.0.1', port), authkey=authkey)
+    logger.info(f"🖥️ Render worker {os.getpid()} listening on 127.0.0.1:{port}")
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception as e:
+            # Failed handshakes (wrong authkey, port scans) must not stop the worker
+            logger.warning(f"⚠️ Render worker rejected a connection: {e}")
+            continue
+        threading.Thread(target=worker.handle, args=(conn,), daemon=True).start()
+
+
+# --- Web process side ---
+
+class RenderWorkerClient:
+    """Starts, supervises and talks to the render worker process"""
+
+    def __init__(self, start_timeout=30):
+        self.start_timeout = start_timeout
+        self._authkey = os.urandom(16)
+        self._process = None
+        self._address = None
+        self._lock = threading.Lock()
+        self.starts = 0
+
+    def _free_port(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def _start(self):
+        port = self._free_port()
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        python_path = os.pathsep.join(filter(None, [project_root, os.environ.get('PYTHONPATH')]))
+        env = dict(os.environ, **{_AUTHKEY_ENV: self._authkey.hex(), _PORT_ENV: str(port), 'PYTHONPATH': python_path})
+        self._process = subprocess.Popen([sys.executable, '-m', 'product_tracker.render_worker'], env=env)
+        self._address = ('127.0.0.1', port)
+        self.starts += 1
+
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Render worker exited during startup (code {self._process.returncode})")
+            try:
+                Client(self._address, authkey=self._authkey).close()
+                logger.info(f"🖥️ Render worker started (pid {self._process.pid})")
+                return
+            except OSError:
+                time.sleep(0.2)
+        self._process.kill()
+        raise RuntimeError(f"Render worker did not start within {self.start_timeout}s")
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            return self._address
+
+    def _wait_for_restart(self):
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+
+    def _request(self, message, timeout):
+        conn = Client(self._ensure_started(), authkey=self._authkey)
+        try:
+            conn.send(message)
+            if not conn.poll(timeout):
+                raise TimeoutError(f"Render worker did not answer within {timeout}s")
+            return conn.recv()
+        finally:
+            conn.close()
+
+    def fetch(self, url, ready_selectors=None, probes=None, cookies=None, timeout=RENDER_WORKER_TIMEOUT, deadline=None):
+        """Render a URL in the worker and return (html, selector probe results, cookies after the load).
+
+        deadline is the job's time left in seconds; the worker stops the render when it passes.
+        """
+        last_error = None
+        message = {'op': 'fetch', 'url': url, 'ready_selectors': ready_selectors, 'probes': probes, 'cookies': cookies,
+                   'deadline': deadline}
+        for attempt in range(2):
+            try:
+                reply = self._request(message, timeout)
+            except (EOFError, ConnectionError) as e:
+                # The worker died or restarted mid-request; try once more on a fresh one
+                last_error = e
+                self._wait_for_restart()
+                continue
+            if reply['ok']:
+                return reply['html'], reply.get('probes') or {}, reply.get('cookies') or []
+            if reply.get('retry'):
+                last_error = RuntimeError(reply['error'])
+                self._wait_for_restart()
+                continue
+            raise RuntimeError(reply['error'])
+        raise RuntimeError(f"Render worker unavailable: {last_error}")
+
+    def stop(self):
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+
+    def get_status(self):
+        running = self._process is not None and self._process.poll() is None
+        status = {'running': running, 'starts': self.starts}
+        if running:
+            try:
+                status.update(self._request({'op': 'status'}, 5)['status'])
+            except Exception as e:
+                status['error'] = str(e)
+        return status
+
+
+# Global render worker client (the process itself starts on first use)
+render_worker = RenderWorkerClient()
+atexit.register(render_worker.stop)
+
+
+def render_page(url, ready_selectors=None, probes=None, cookies=None, timeout=RENDER_WORKER_TIMEOUT, deadline=None):
+    """Render a URL in the out-of-process worker and return (html, selector probe results, cookies)"""
+    return render_worker.fetch(url, ready_selectors, probes, cookies, timeout, deadline)
+
+
+def get_render_worker_status():
+    """Get render worker process status"""
+    return render_worker.get_status()
+
+
+def stop_render_worker():
+    """Stop the render worker process"""
+    render_worker.stop()
+
+
+if __name__ == '__main__':
+    worker_main()
@@ -0,0 +1,136 @@
+"""
+On-disk HTTP revalidation cache for product pages
+
+Stores the ETag / Last-Modified validators, a hash of the body and the
+fields extracted from it for each product, keyed by product_id(). The next check sends a
+conditional request; on 304 Not Modified, or when the new body hashes to
+the same value, the cached fields are reused and the page is not parsed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+
+from product_tracker.config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_DIR
+from product_tracker.identity import product_id
+
+logger = logging.getLogger(__name__)
+
+
+def body_hash(content):
+    if isinstance(content, str):
+        content = content.encode('utf-8', errors='replace')
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory=RESPONSE_CACHE_DIR, enabled=RESPONSE_CACHE_ENABLED):
+        self.directory = directory
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+        # Counters for the debug pages
+        self.hits_not_modified = 0
+        self.hits_same_body = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, url):
+        """Return the cached entry for a URL's product, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(product_id(url))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def conditional_headers(self, entry):
+        """Request headers that let the server answer 304 for an unchanged page"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, entry, status_code, content):
+        """Return cached fields if the response shows the page is unchanged, else None"""
+        if not entry or 'fields' not in entry:
+            if self.enabled:
+                with self._lock:
+                    self.misses += 1
+            return None
+        if status_code == 304:
+            with self._lock:
+                self.hits_not_modified += 1
+                self.bytes_saved += entry.get('body_bytes', 0)
+            return entry['fields']
+        if status_code == 200 and content is not None and body_hash(content) == entry.get('body_hash'):
+            with self._lock:
+                self.hits_same_body += 1
+            return entry['fields']
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def store(self, url, response_headers, content, fields):
+        """Remember validators, body hash and extracted fields for a URL"""
+        if not self.enabled:
+            return
+        key = product_id(url)
+        headers = response_headers or {}
+        entry = {
+            'product_id': key,
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body_hash': body_hash(content),
+            'body_bytes': len(content),
+            'fields': fields,
+            'stored_at': time.time(),
+        }
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write cache entry for {key}: {e}")
+
+    def get_status(self):
+        with self._lock:
+            hits = self.hits_not_modified + self.hits_same_body
+            total = hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'directory': self.directory,
+                'hits_not_modified': self.hits_not_modified,
+                'hits_same_body': self.hits_same_body,
+                'misses': self.misses,
+                'hit_rate': round(hits / total, 3) if total else None,
+                'bytes_saved': self.bytes_saved,
+            }
+
+
+# Global response cache instance
+response_cache = ResponseCache()
+
+
+def get_response_cache_status():
+    """Get response cache hit/miss counters"""
+    return response_cache.get_status()
@@ -23,9 +23,12 @@ def send_daily_tracking_summary():
         msg += f"<b>Target:</b> {price} | <b>Start:</b> {start_time}| <b>Freq(h):</b> {interval}  | <b>Messaing to:</b> {chat_ids_str} | {url}\n"
     for chat_id in ['249722033', '258922383']:
         send_telegram_message(msg, chat_id, parse_mode='HTML')
-import uuid
+import time
+import hashlib
+import threading
 import pytz
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
 import atexit
@@ -35,6 +38,7 @@ IST = pytz.timezone('Asia/Kolkata')
 
 # Import database functions
 from product_tracker.database import (
+    db,
     load_scheduled, 
     save_scheduled, 
     add_scheduled_product, 
@@ -42,46 +46,70 @@ from product_tracker.database import (
     get_database_status
 )
 
+from product_tracker.identity import product_id
+from product_tracker.config import (
+    SCHEDULE_SPREAD_MINUTES,
+    SCHEDULER_MODE,
+    SCHEDULER_TICK_MINUTES,
+    SCHEDULER_JOB_STORE,
+    SCHEDULER_JOBS_COLLECTION,
+    CATCHUP_MAX_RUNS,
+    CATCHUP_MAX_AGE_HOURS,
+    CATCHUP_PER_MINUTE,
+    ADAPTIVE_POLLING,
+    ADAPTIVE_REPLAN_MINUTES,
+)
+from product_tracker.adaptive import adaptive_planner, get_adaptive_status
+from product_tracker.urls import get_domain
+from product_tracker.ratelimit import CircuitOpenError, RateLimitExceeded
+from product_tracker.admission import AdmissionTimeout, job_deadline
+
 scheduled_products = load_scheduled()
 
 _scheduler = None
-_job_ids = {}
+_job_specs = {}  # job ID -> cron fields it was scheduled with
 
-def _run_product_job(item):
+SCHEDULER_MODE_TICK = 'tick'
+TICK_JOB_ID = 'product_tick'
+
+def _run_product_job(item, scraped=None, alternates=None):
     print(f"[_run_product_job] Called with: item={item}")
     try:
         from product_tracker.tracker import track_product
         print(f"[_run_product_job] Starting tracking for {item['product_url']}")
-        result = track_product(
-            item['product_url'],
-            item['target_price'],
-            'telegram',
-            item['telegram_chat_ids']
-        )
+        # Hard limit for the whole check; a hung page cannot hold this thread past it
+        with job_deadline():
+            result = track_product(
+                item['product_url'],
+                item['target_price'],
+                'telegram',
+                item['telegram_chat_ids'],
+                scraped=scraped,
+                alternates=alternates
+            )
         print(f"[_run_product_job] Tracking completed successfully: {result}")
         return result
+    except (CircuitOpenError, RateLimitExceeded, AdmissionTimeout) as e:
+        # The site is blocking or throttling us, or no fetch slot was free; skip quietly until the next run
+        print(f"[_run_product_job] Skipped: {str(e)}")
     except Exception as e:
         print(f"[_run_product_job] ERROR: {str(e)}")
         import traceback
         traceback.print_exc()
-        # Send error notification
-        from product_tracker.notifier import send_telegram_message
-        error_msg = f"🚨 Scheduled job failed!\n\nURL: {item['product_url']}\nError: {str(e)}"
-        for chat_id in item['telegram_chat_ids']:
-            try:
-                send_telegram_message(error_msg, chat_id)
-            except:
-                pass
+        _notify_job_error(item, e)
 
-def _add_job_for_product(idx, item):
-    print(f"[_add_job_for_product] Called with: idx={idx}, item={item}")
-    global _scheduler, _job_ids
-    
-    if _scheduler is None:
-        print(f"[_add_job_for_product] Scheduler not initialized!")
-        return
-        
-    job_id = f"product_{idx}_{uuid.uuid4().hex[:8]}"
+def _notify_job_error(item, error):
+    # Send error notification
+    from product_tracker.notifier import send_telegram_message
+    error_msg = f"🚨 Scheduled job failed!\n\nURL: {item['product_url']}\nError: {str(error)}"
+    for chat_id in item['telegram_chat_ids']:
+        try:
+            send_telegram_message(error_msg, chat_id)
+        except:
+            pass
+
+def _run_hours(item):
+    """(run hours, minute) of a product's cron schedule from its start_time, interval and night mode"""
     interval = item.get('schedule_interval', 4)
     start_time = item.get('start_time', '00:00')
     
@@ -90,112 +118,346 @@ def _add_job_for_product(idx, item):
         try:
             hour, minute = map(int, start_time.split(':'))
         except Exception as e:
-            print(f"[_add_job_for_product] Invalid start_time format: {start_time}, using 00:00")
+            print(f"[_run_hours] Invalid start_time format: {start_time}, using 00:00")
             hour, minute = 0, 0
     
-    try:
-        # Check if this is a night-mode job (runs only during specified night hours)
-        night_mode = item.get('night_mode', False)
-        night_end = item.get('night_end', '09:00')
+    # Check if this is a night-mode job (runs only during specified night hours)
+    night_mode = item.get('night_mode', False)
+    night_end = item.get('night_end', '09:00')
+    
+    if night_mode:
+        # Parse night end time
+        try:
+            night_end_hour, night_end_minute = map(int, night_end.split(':'))
+        except:
+            night_end_hour, night_end_minute = 9, 0
         
-        if night_mode:
-            # Parse night end time
-            try:
-                night_end_hour, night_end_minute = map(int, night_end.split(':'))
-            except:
-                night_end_hour, night_end_minute = 9, 0
-            
-            # Calculate night hours: from start_time to night_end (crossing midnight)
-            run_hours = []
-            current_hour = hour
-            
-            # Generate hours from start_time until midnight
-            while current_hour < 24:
+        # Calculate night hours: from start_time to night_end (crossing midnight)
+        run_hours = []
+        current_hour = hour
+        
+        # Generate hours from start_time until midnight
+        while current_hour < 24:
+            run_hours.append(current_hour)
+            current_hour += interval
+        
+        # Generate hours from midnight until night_end
+        current_hour = 0
+        while current_hour <= night_end_hour:
+            if current_hour not in run_hours:  # Avoid duplicates
                 run_hours.append(current_hour)
-                current_hour += interval
-            
-            # Generate hours from midnight until night_end
-            current_hour = 0
-            while current_hour <= night_end_hour:
-                if current_hour not in run_hours:  # Avoid duplicates
-                    run_hours.append(current_hour)
-                current_hour += interval
-                if current_hour > night_end_hour:
-                    break
-            
-            # Sort the hours for better readability
-            run_hours.sort()
-            print(f"[_add_job_for_product] Night mode - Run hours: {run_hours} (from {start_time} to {night_end})")
-        else:
-            # Calculate all the hours when the job should run based on start_time and interval (regular mode)
-            run_hours = []
-            current_hour = hour
-            
-            # Generate all run hours for a 24-hour period
-            while len(run_hours) < 24 // interval:
-                run_hours.append(current_hour % 24)
-                current_hour += interval
-                if current_hour >= 24 and current_hour % 24 in run_hours:
-                    break
+            current_hour += interval
+            if current_hour > night_end_hour:
+                break
         
-        print(f"[_add_job_for_product] Calculated run hours: {run_hours}")
+        # Sort the hours for better readability
+        run_hours.sort()
+    else:
+        # Calculate all the hours when the job should run based on start_time and interval (regular mode)
+        run_hours = []
+        current_hour = hour
         
-        # Use cron scheduling to run at specific hours
-        if len(run_hours) == 1:
-            # Single run per day
-            job = _scheduler.add_job(
-                lambda i=item: _run_product_job(i),
-                'cron',
-                hour=run_hours[0],
-                minute=minute,
-                id=job_id,
-                replace_existing=True,
-                coalesce=True,
-                max_instances=1
-            )
-        else:
-            # Multiple runs per day - use comma-separated hours
-            hours_str = ','.join(map(str, run_hours))
-            job = _scheduler.add_job(
-                lambda i=item: _run_product_job(i),
-                'cron',
-                hour=hours_str,
-                minute=minute,
-                id=job_id,
+        # Generate all run hours for a 24-hour period
+        while len(run_hours) < 24 // interval:
+            run_hours.append(current_hour % 24)
+            current_hour += interval
+            if current_hour >= 24 and current_hour % 24 in run_hours:
+                break
+    
+    return run_hours, minute
+
+def _polled_item(item):
+    """The item with its adaptive interval when adaptive polling has planned one"""
+    if ADAPTIVE_POLLING:
+        interval = adaptive_planner.interval_for(item)
+        if interval:
+            return dict(item, schedule_interval=interval)
+    return item
+
+def _runs_per_day(item, interval):
+    return len(_run_hours(dict(item, schedule_interval=interval))[0])
+
+def _spread_offset(pid, window=None):
+    """Minutes a product's runs are pushed past its start time: a hash of its product ID, so stable across restarts"""
+    window = SCHEDULE_SPREAD_MINUTES if window is None else window
+    if window <= 0:
+        return 0
+    return int(hashlib.sha1(pid.encode('utf-8')).hexdigest()[:8], 16) % window
+
+def get_spread_offset(item):
+    """Minutes a scheduled product's runs are shifted past its start time (0 when spreading is off)"""
+    return _spread_offset(item['product_id'])
+
+def _cron_spec(item, window=None):
+    """Cron fields for a product's job; two items with the same spec need no reschedule.
+    
+    Every run is shifted by the same offset, so the user's cadence is kept
+    and only the minute (and, past the hour, the hours) move.
+    """
+    run_hours, minute = _run_hours(_polled_item(item))
+    pid = item['product_id']
+    carry, minute = divmod(minute + _spread_offset(pid, window), 60)
+    run_hours = sorted((h + carry) % 24 for h in run_hours)
+    return {'hour': ','.join(map(str, run_hours)), 'minute': minute}
+
+def get_projected_load(products=None, window=None):
+    """Scheduled product runs in each minute of the day (1440 counts, 00:00 first)"""
+    load = [0] * 1440
+    for item in scheduled_products if products is None else products:
+        try:
+            spec = _cron_spec(item, window)
+        except Exception:
+            continue
+        for hour in spec['hour'].split(','):
+            load[int(hour) * 60 + spec['minute']] += 1
+    return load
+
+def get_load_summary(products=None):
+    """Peak per-minute load with and without spreading, for the debug page"""
+    load = get_projected_load(products)
+    unlevelled = get_projected_load(products, window=0)
+    peak = max(load)
+    return {
+        'spread_minutes': SCHEDULE_SPREAD_MINUTES,
+        'runs_per_day': sum(load),
+        'busy_minutes': sum(1 for n in load if n),
+        'peak_per_minute': peak,
+        'peak_at': [f"{m // 60:02d}:{m % 60:02d}" for m, n in enumerate(load) if n == peak and peak][:5],
+        'unlevelled_peak_per_minute': max(unlevelled),
+        'load': load,
+    }
+
+def _job_keys(products):
+    """Stable job ID per scheduled product: its product ID, suffixed when the same product is scheduled again"""
+    keys, seen = [], {}
+    for item in products:
+        pid = item['product_id']
+        seen[pid] = seen.get(pid, 0) + 1
+        keys.append(f"product_{pid}" if seen[pid] == 1 else f"product_{pid}_{seen[pid]}")
+    return keys
+
+def _find_scheduled(job_key):
+    """The scheduled product a job ID currently belongs to, or None"""
+    for key, item in zip(_job_keys(scheduled_products), scheduled_products):
+        if key == job_key:
+            return item
+    return None
+
+def _run_scheduled_job(job_key):
+    """Job entry point: runs whatever the product under job_key looks like now, so edits need no reschedule"""
+    item = _find_scheduled(job_key)
+    if item is None:
+        print(f"[_run_scheduled_job] No scheduled product for {job_key}, skipping")
+        return None
+    return _run_product_job(item)
+
+class _ReconcileStats:
+    """Latency of job adds/updates/removes and of whole reconciles, against the number of jobs"""
+
+    def __init__(self, history=50):
+        self._lock = threading.Lock()
+        self.ops = {op: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0} for op in ('add', 'update', 'remove')}
+        self.reconciles = deque(maxlen=history)
+
+    def record_op(self, op, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            stats = self.ops[op]
+            stats['count'] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+
+    def record_reconcile(self, jobs, added, updated, removed, seconds):
+        with self._lock:
+            self.reconciles.append({
+                'at': datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S'),
+                'jobs': jobs,
+                'added': added,
+                'updated': updated,
+                'removed': removed,
+                'ms': round(seconds * 1000, 2),
+            })
+
+    def get_status(self):
+        with self._lock:
+            ops = {
+                op: {
+                    'count': s['count'],
+                    'mean_ms': round(s['total_ms'] / s['count'], 2) if s['count'] else None,
+                    'max_ms': round(s['max_ms'], 2),
+                }
+                for op, s in self.ops.items()
+            }
+            return {'operations': ops, 'recent_reconciles': list(self.reconciles)}
+
+_reconcile_stats = _ReconcileStats()
+_reconcile_lock = threading.Lock()
+
+def reconcile_jobs():
+    """Bring the scheduler's product jobs in line with scheduled_products.
+    
+    Only jobs whose product was added or removed, or whose cron fields
+    changed, are touched; the rest keep their job and next run time.
+    """
+    print(f"[reconcile_jobs] Called with no arguments")
+    global _scheduler, _job_specs
+    
+    if _scheduler is None:
+        print(f"[reconcile_jobs] Scheduler not initialized!")
+        return
+    
+    with _reconcile_lock:
+        started = time.perf_counter()
+        if ADAPTIVE_POLLING:
+            adaptive_planner.plan(list(scheduled_products), _runs_per_day)
+        desired = {}
+        # In tick mode the single tick job finds due products itself
+        products = [] if SCHEDULER_MODE == SCHEDULER_MODE_TICK else scheduled_products
+        for key, item in zip(_job_keys(products), products):
+            try:
+                desired[key] = _cron_spec(item)
+            except Exception as e:
+                print(f"[reconcile_jobs] ERROR computing schedule for {item.get('product_url')}: {str(e)}")
+        
+        added = updated = removed = 0
+        for key in [k for k in _job_specs if k not in desired]:
+            op_started = time.perf_counter()
+            if _scheduler.get_job(key):
+                _scheduler.remove_job(key)
+            del _job_specs[key]
+            _reconcile_stats.record_op('remove', time.perf_counter() - op_started)
+            removed += 1
+        
+        for key, spec in desired.items():
+            if _job_specs.get(key) == spec and _scheduler.get_job(key):
+                continue
+            op = 'update' if key in _job_specs else 'add'
+            op_started = time.perf_counter()
+            try:
+                job = _scheduler.add_job(
+                    _run_scheduled_job,
+                    'cron',
+                    args=[key],
+                    hour=spec['hour'],
+                    minute=spec['minute'],
+                    id=key,
+                    replace_existing=True,
+                    coalesce=True,
+                    max_instances=1
+                )
+            except Exception as e:
+                print(f"[reconcile_jobs] ERROR adding job {key}: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                continue
+            _job_specs[key] = spec
+            _reconcile_stats.record_op(op, time.perf_counter() - op_started)
+            if op == 'add':
+                added += 1
+            else:
+                updated += 1
+            print(f"[reconcile_jobs] {op}: {key} hours={spec['hour']} minute={spec['minute']}, next run: {job.next_run_time}")
+        
+        if SCHEDULER_MODE != SCHEDULER_MODE_TICK and _scheduler.get_job(TICK_JOB_ID):
+            # Left in the persisted job store by an earlier run in tick mode
+            _scheduler.remove_job(TICK_JOB_ID)
+        if SCHEDULER_MODE == SCHEDULER_MODE_TICK and not _scheduler.get_job(TICK_JOB_ID):
+            _scheduler.add_job(
+                _run_due_products,
+                'interval',
+                minutes=SCHEDULER_TICK_MINUTES,
+                id=TICK_JOB_ID,
                 replace_existing=True,
                 coalesce=True,
                 max_instances=1
             )
+            print(f"[reconcile_jobs] Tick job added: every {SCHEDULER_TICK_MINUTES} min")
         
-        _job_ids[idx] = job_id
-        print(f"[_add_job_for_product] Job {job_id} scheduled successfully with cron pattern")
-        print(f"[_add_job_for_product] Run hours: {run_hours} at minute: {minute}")
-        print(f"[_add_job_for_product] Next run: {job.next_run_time}")
-        
-    except Exception as e:
-        print(f"[_add_job_for_product] ERROR adding job: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        elapsed = time.perf_counter() - started
+        _reconcile_stats.record_reconcile(len(_job_specs), added, updated, removed, elapsed)
+    print(f"[reconcile_jobs] {len(_job_specs)} jobs: +{added} ~{updated} -{removed} in {elapsed * 1000:.1f}ms")
+
+def _run_times(spec, now):
+    """Run times of a cron spec from yesterday through tomorrow, around now"""
+    times = []
+    for day in (-1, 0, 1):
+        for hour in spec['hour'].split(','):
+            times.append(now.replace(hour=int(hour), minute=spec['minute'], second=0, microsecond=0) + timedelta(days=day))
+    return times
+
+def _is_due(spec, since, now):
+    return any(since < t <= now for t in _run_times(spec, now))
+
+def _next_due(spec, now):
+    return min(t for t in _run_times(spec, now) if t > now)
+
+class _TickStats:
+    """What the tick scheduler collected and ran"""
 
-def _remove_job_for_product(idx):
-    print(f"[_remove_job_for_product] Called with: idx={idx}")
-    global _scheduler, _job_ids
-    job_id = _job_ids.get(idx)
-    if job_id and _scheduler.get_job(job_id):
-        _scheduler.remove_job(job_id)
-    _job_ids.pop(idx, None)
-
-def _refresh_all_jobs():
-    print(f"[_refresh_all_jobs] Called with no arguments")
-    global _scheduler, _job_ids
-    # Remove all jobs
-    for job_id in list(_job_ids.values()):
-        if _scheduler.get_job(job_id):
-            _scheduler.remove_job(job_id)
-    _job_ids.clear()
-    # Add jobs for all products
-    for idx, item in enumerate(scheduled_products):
-        _add_job_for_product(idx, item)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_tick = None  # End of the window the last tick collected
+        self.ticks = 0
+        self.runs = 0
+        self.last = None
+
+    def record(self, window_start, window_end, due, domains, distinct, seconds):
+        with self._lock:
+            self.ticks += 1
+            self.runs += due
+            self.last = {
+                'window': f"{window_start.strftime('%H:%M:%S')} - {window_end.strftime('%H:%M:%S')}",
+                'due': due,
+                'domains': domains,
+                'distinct_products': distinct,
+                'elapsed_s': round(seconds, 2),
+            }
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'tick_minutes': SCHEDULER_TICK_MINUTES,
+                'ticks': self.ticks,
+                'product_runs': self.runs,
+                'last_tick': self.last,
+            }
+
+_tick_stats = _TickStats()
+
+def _collect_due(since, now):
+    """Products with a run time in (since, now], ordered by domain then product"""
+    due = []
+    for item in list(scheduled_products):
+        try:
+            if _is_due(_cron_spec(item), since, now):
+                due.append(item)
+        except Exception as e:
+            print(f"[_collect_due] ERROR computing schedule for {item.get('product_url')}: {str(e)}")
+    due.sort(key=lambda i: (get_domain(i['product_url']), i['product_id']))
+    return due
+
+def _run_due_products():
+    """Tick job: run every product that came due since the last tick as one batch.
+    
+    The batch scrapes each distinct product once, paces each domain and
+    shares browsers and connections; a tick that runs long simply makes the
+    next window wider, so no run is lost.
+    """
+    from product_tracker.batch import run_batch
+    
+    now = datetime.now(IST)
+    since = _tick_stats.last_tick or now - timedelta(minutes=SCHEDULER_TICK_MINUTES)
+    since = max(since, now - timedelta(days=1))
+    _tick_stats.last_tick = now
+    
+    started = time.monotonic()
+    due = _collect_due(since, now)
+    domains = len({get_domain(i['product_url']) for i in due})
+    distinct = len({i['product_id'] for i in due})
+    print(f"[_run_due_products] {len(due)} due ({distinct} products on {domains} domains) since {since.strftime('%H:%M:%S')}")
+    if due:
+        run_batch(due, on_result=_handle_batch_result)
+    _tick_stats.record(since, now, len(due), domains, distinct, time.monotonic() - started)
 
 def schedule_product_tracking(product_url, target_price, telegram_token, telegram_chat_id, schedule_interval=4):
     print(f"[schedule_product_tracking] Called with: product_url={product_url}, target_price={target_price}, telegram_token={telegram_token}, telegram_chat_id={telegram_chat_id}, schedule_interval={schedule_interval}")
@@ -205,6 +467,7 @@ def schedule_product_tracking(product_url, target_price, telegram_token, telegra
     chat_ids = telegram_chat_id if isinstance(telegram_chat_id, list) else [telegram_chat_id]
     scheduled_products.append({
         'product_url': product_url,
+        'product_id': product_id(product_url),
         'target_price': target_price,
         'telegram_token': telegram_token,
         'telegram_chat_ids': chat_ids,
@@ -212,20 +475,19 @@ def schedule_product_tracking(product_url, target_price, telegram_token, telegra
         'start_time': start_time
     })
     save_scheduled(scheduled_products)
-    _refresh_all_jobs()
+    reconcile_jobs()
 
 def delete_scheduled(idx):
     print(f"[delete_scheduled] Called with: idx={idx}")
     print(f"[delete_scheduled] Returning: None")
     if 0 <= idx < len(scheduled_products):
-        _remove_job_for_product(idx)
         scheduled_products.pop(idx)
         save_scheduled(scheduled_products)
-        _refresh_all_jobs()
+        reconcile_jobs()
 
 def get_scheduler_status():
     """Get current scheduler status and job information"""
-    global _scheduler, _job_ids
+    global _scheduler, _job_specs
     
     if _scheduler is None:
         return {"status": "not_initialized", "jobs": []}
@@ -233,32 +495,42 @@ def get_scheduler_status():
     status = {
         "status": "running" if _scheduler.running else "stopped",
         "jobs": [],
-        "total_jobs": len(_job_ids)
+        "mode": SCHEDULER_MODE,
+        "total_jobs": len(_job_specs),
+        "reconcile": _reconcile_stats.get_status(),
+        "load": get_load_summary()
     }
+    if SCHEDULER_MODE == SCHEDULER_MODE_TICK:
+        status["tick"] = _tick_stats.get_status()
+    if ADAPTIVE_POLLING:
+        status["adaptive"] = get_adaptive_status()
+    status["startup"] = _catchup_stats.get_status()
     
-    for idx, job_id in _job_ids.items():
+    now = datetime.now(IST)
+    
+    for idx, (job_id, item) in enumerate(zip(_job_keys(scheduled_products), scheduled_products)):
         job = _scheduler.get_job(job_id)
         if job:
-            # Get schedule pattern info
-            trigger_info = str(job.trigger)
-            schedule_pattern = "Unknown"
-            
-            if hasattr(job.trigger, 'fields'):
-                try:
-                    hour_field = job.trigger.fields[1]  # hour field
-                    minute_field = job.trigger.fields[0]  # minute field
-                    schedule_pattern = f"Hours: {hour_field}, Minutes: {minute_field}"
-                except:
-                    schedule_pattern = trigger_info
-            
+            spec = _job_specs.get(job_id, {})
             status["jobs"].append({
                 "idx": idx,
                 "job_id": job_id,
                 "next_run": str(job.next_run_time) if job.next_run_time else "None",
-                "schedule_pattern": schedule_pattern,
-                "interval": scheduled_products[idx]['schedule_interval'] if idx < len(scheduled_products) else "Unknown",
-                "start_time": scheduled_products[idx]['start_time'] if idx < len(scheduled_products) else "Unknown",
-                "product_url": scheduled_products[idx]['product_url'] if idx < len(scheduled_products) else "Unknown"
+                "schedule_pattern": f"Hours: {spec.get('hour')}, Minutes: {spec.get('minute')}" if spec else str(job.trigger),
+                "interval": item.get('schedule_interval', "Unknown"),
+                "start_time": item.get('start_time', "Unknown"),
+                "product_url": item['product_url']
+            })
+        elif SCHEDULER_MODE == SCHEDULER_MODE_TICK:
+            spec = _cron_spec(item)
+            status["jobs"].append({
+                "idx": idx,
+                "job_id": TICK_JOB_ID,
+                "next_run": f"{_next_due(spec, now)} (first tick after)",
+                "schedule_pattern": f"Hours: {spec['hour']}, Minutes: {spec['minute']}",
+                "interval": item.get('schedule_interval', "Unknown"),
+                "start_time": item.get('start_time', "Unknown"),
+                "product_url": item['product_url']
             })
         else:
             status["jobs"].append({
@@ -266,16 +538,16 @@ def get_scheduler_status():
                 "job_id": job_id,
                 "next_run": "Job not found!",
                 "schedule_pattern": "Error",
-                "interval": "Unknown",
-                "start_time": "Unknown",
-                "product_url": "Unknown"
+                "interval": item.get('schedule_interval', "Unknown"),
+                "start_time": item.get('start_time', "Unknown"),
+                "product_url": item['product_url']
             })
     
     return status
 
 def trigger_job_now(idx):
     """Manually trigger a specific job for testing"""
-    global _scheduler, _job_ids
+    global _scheduler
     
     if idx >= len(scheduled_products):
         return f"Invalid index: {idx}"
@@ -288,6 +560,141 @@ def trigger_job_now(idx):
     except Exception as e:
         return f"Job failed: {str(e)}"
 
+def _handle_batch_result(batch_result):
+    """Notify for one product scraped by a batch; returns (ok, message)"""
+    if batch_result['error']:
+        _notify_job_error(batch_result['item'], batch_result['error'])
+        return False, batch_result['error']
+    if batch_result['skipped']:
+        print(f"[_handle_batch_result] Skipped: {batch_result['skipped']}")
+        return False, f"Skipped: {batch_result['skipped']}"
+    scraped = (batch_result['price'], batch_result['title'], batch_result['coupon'])
+    result = _run_product_job(batch_result['item'], scraped=scraped, alternates=batch_result['alternates'])
+    return True, f"Job triggered successfully: {result}"
+
+def trigger_all_jobs_now():
+    """Scrape every scheduled product concurrently, then notify each one"""
+    from product_tracker.batch import run_batch
+    
+    results = []
+    
+    def notify(batch_result):
+        ok, message = _handle_batch_result(batch_result)
+        results.append((batch_result['idx'], ok, message))
+    
+    print(f"[trigger_all_jobs_now] Triggering {len(scheduled_products)} products as one batch")
+    run_batch(list(scheduled_products), on_result=notify)
+    results.sort()
+    return results
+
+def _job_stores():
+    """(jobstores, name): MongoDB when configured and connected, else APScheduler's in-memory default"""
+    if SCHEDULER_JOB_STORE == 'mongodb' and db.connected:
+        from apscheduler.jobstores.mongodb import MongoDBJobStore
+        store = MongoDBJobStore(database=db.mongodb_database, collection=SCHEDULER_JOBS_COLLECTION, client=db.client)
+        return {'default': store}, 'mongodb'
+    return {}, 'memory'
+
+def _trigger_spec(trigger):
+    """Cron fields of a restored job in the form _cron_spec produces, or None"""
+    try:
+        fields = {f.name: str(f) for f in trigger.fields}
+        return {'hour': fields['hour'], 'minute': int(fields['minute'])}
+    except Exception:
+        return None
+
+def _restore_jobs(now):
+    """Adopt jobs restored from the job store and move overdue ones past now.
+    
+    Returns [(first missed run time, item)] for products that missed runs
+    while the instance was down. Must run while the scheduler is paused.
+    """
+    items = dict(zip(_job_keys(scheduled_products), scheduled_products))
+    missed = []
+    for job in _scheduler.get_jobs():
+        overdue = job.next_run_time is not None and job.next_run_time < now
+        if job.func is _run_scheduled_job:
+            spec = _trigger_spec(job.trigger)
+            if spec:
+                # Unchanged jobs are left alone by reconcile_jobs and keep their run times
+                _job_specs[job.id] = spec
+            if overdue and job.id in items:
+                missed.append((job.next_run_time, items[job.id]))
+        elif job.id == TICK_JOB_ID and overdue and SCHEDULER_MODE == SCHEDULER_MODE_TICK:
+            # The tick due at next_run_time collected from one interval before it
+            since = job.next_run_time - timedelta(minutes=SCHEDULER_TICK_MINUTES)
+            missed.extend((since, item) for item in _collect_due(since, now))
+            _tick_stats.last_tick = now
+        else:
+            continue
+        if overdue:
+            job.modify(next_run_time=job.trigger.get_next_fire_time(None, now))
+    return missed
+
+class _CatchUpStats:
+    """Startup restore and missed-run catch-up, for the debug page"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.job_store = None
+        self.startup_ms = None
+        self.restored_jobs = 0
+        self.missed = 0
+        self.dropped = 0
+        self.pending = 0
+        self.caught_up = 0
+        self.running = False
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'job_store': self.job_store,
+                'startup_ms': self.startup_ms,
+                'restored_jobs': self.restored_jobs,
+                'missed': self.missed,
+                'dropped': self.dropped,
+                'pending': self.pending,
+                'caught_up': self.caught_up,
+                'running': self.running,
+            }
+
+_catchup_stats = _CatchUpStats()
+
+def _select_catch_up(missed, now):
+    """Missed runs worth making up: recent enough, one per product, oldest first, at most CATCHUP_MAX_RUNS"""
+    cutoff = now - timedelta(hours=CATCHUP_MAX_AGE_HOURS)
+    selected, seen = [], set()
+    for missed_at, item in sorted(missed, key=lambda m: m[0]):
+        if missed_at < cutoff or id(item) in seen:
+            continue
+        seen.add(id(item))
+        selected.append(item)
+    return selected[:CATCHUP_MAX_RUNS]
+
+def _catch_up_missed(items):
+    """Run missed products in batches of CATCHUP_PER_MINUTE, one batch a minute"""
+    from product_tracker.batch import run_batch
+    
+    per_minute = max(1, CATCHUP_PER_MINUTE)
+    with _catchup_stats._lock:
+        _catchup_stats.running = True
+    try:
+        for start in range(0, len(items), per_minute):
+            batch_started = time.monotonic()
+            chunk = items[start:start + per_minute]
+            print(f"[_catch_up_missed] Making up {len(chunk)} missed runs ({start + len(chunk)}/{len(items)})")
+            run_batch(chunk, on_result=_handle_batch_result)
+            with _catchup_stats._lock:
+                _catchup_stats.caught_up += len(chunk)
+                _catchup_stats.pending -= len(chunk)
+            if start + per_minute < len(items):
+                time.sleep(max(0.0, 60 - (time.monotonic() - batch_started)))
+    except Exception as e:
+        print(f"[_catch_up_missed] ERROR: {str(e)}")
+    finally:
+        with _catchup_stats._lock:
+            _catchup_stats.running = False
+
 def start_scheduler():
     global _scheduler
     print(f"[start_scheduler] Called with no arguments")
@@ -310,12 +717,26 @@ def start_scheduler():
         'misfire_grace_time': 60  # Grace period for missed jobs (60 seconds)
     }
     
+    jobstores, store_name = _job_stores()
     _scheduler = BackgroundScheduler(
+        jobstores=jobstores,
         executors=executors, 
         job_defaults=job_defaults,
         timezone=IST  # Set timezone to IST
     )
-    _scheduler.start()
+    # Paused until restored jobs are adopted, so overdue ones are neither run nor dropped as misfires
+    started = time.perf_counter()
+    _scheduler.start(paused=True)
+    now = datetime.now(IST)
+    missed = _restore_jobs(now)
+    catch_up = _select_catch_up(missed, now)
+    with _catchup_stats._lock:
+        _catchup_stats.job_store = store_name
+        _catchup_stats.restored_jobs = len(_job_specs)
+        _catchup_stats.missed = len(missed)
+        _catchup_stats.dropped = len(missed) - len(catch_up)
+        _catchup_stats.pending = len(catch_up)
+    print(f"[start_scheduler] Job store: {store_name}, restored {len(_job_specs)} product jobs, {len(missed)} missed runs ({len(catch_up)} to make up)")
     
     # Schedule daily summary at 8am
     _scheduler.add_job(
@@ -331,11 +752,29 @@ def start_scheduler():
     print(f"[start_scheduler] Returning: None")
     
     atexit.register(lambda: _scheduler.shutdown())
-    _refresh_all_jobs()
+    reconcile_jobs()
+    
+    if not ADAPTIVE_POLLING and _scheduler.get_job('adaptive_replan'):
+        _scheduler.remove_job('adaptive_replan')
+    if ADAPTIVE_POLLING:
+        # New prices change the plan; reconcile only reschedules products whose interval moved
+        _scheduler.add_job(
+            reconcile_jobs,
+            'interval',
+            minutes=ADAPTIVE_REPLAN_MINUTES,
+            id='adaptive_replan',
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1
+        )
+    
+    _scheduler.resume()
+    with _catchup_stats._lock:
+        _catchup_stats.startup_ms = round((time.perf_counter() - started) * 1000, 1)
+    if catch_up:
+        threading.Thread(target=_catch_up_missed, args=(catch_up,), name='missed-run-catchup', daemon=True).start()
     
     # Add logging for job events
     import logging
     logging.basicConfig(level=logging.INFO)
     _scheduler._logger.setLevel(logging.DEBUG)
-
-start_scheduler()
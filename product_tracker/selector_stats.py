@@ -0,0 +1,119 @@
+"""
+Selector hit counts and single round-trip selector probes
+
+Candidate selectors for a field (e.g. the five Amazon price selectors) are
+always tried in their declared priority order: the order decides which
+price wins on a page where several match, so it is not learned. Which
+selector matched is counted and persisted to SELECTOR_STATS_FILE for the
+debug pages.
+
+In a browser, all candidates for all fields are evaluated with a single
+execute_script call instead of one find_element round trip per selector.
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+import logging
+
+from product_tracker.config import SELECTOR_STATS_FILE
+
+logger = logging.getLogger(__name__)
+
+# Returns {name: {selector, text, html}} for the first non-empty match of each probe
+_PROBE_JS = """
+var probes = arguments[0], out = {};
+for (var name in probes) {
+    var probe = probes[name];
+    for (var i = 0; i < probe.selectors.length; i++) {
+        var el = document.querySelector(probe.selectors[i]);
+        if (!el) { continue; }
+        var text = (el.textContent || '').trim();
+        if (!text) { continue; }
+        out[name] = {selector: probe.selectors[i], text: text, html: probe.html ? el.outerHTML : null};
+        break;
+    }
+}
+return out;
+"""
+
+
+class SelectorStats:
+    def __init__(self, path=SELECTOR_STATS_FILE, save_interval=60):
+        self.path = path
+        self.save_interval = save_interval
+        self._hits = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._hits = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load selector stats: {e}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            data = json.dumps(self._hits, indent=2)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save selector stats: {e}")
+
+    def record_hit(self, group, selector):
+        with self._lock:
+            group_hits = self._hits.setdefault(group, {})
+            group_hits[selector] = group_hits.get(selector, 0) + 1
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def get_status(self):
+        with self._lock:
+            return {group: dict(hits) for group, hits in self._hits.items()}
+
+
+# Global selector stats instance
+selector_stats = SelectorStats()
+atexit.register(selector_stats.save)
+
+
+def build_probe_request(probes):
+    """Turn adapter probe specs into the form sent to the browser (selectors in priority order)"""
+    return {
+        name: {'selectors': list(spec['selectors']), 'html': spec.get('html', False)}
+        for name, spec in probes.items()
+    }
+
+
+def run_probes(driver, probe_request):
+    """Evaluate every probe in one execute_script round trip"""
+    if not probe_request:
+        return {}
+    return driver.execute_script(_PROBE_JS, probe_request) or {}
+
+
+def record_probe_hits(probes, results):
+    for name, result in results.items():
+        if name in probes:
+            selector_stats.record_hit(probes[name]['group'], result['selector'])
+
+
+def get_selector_stats():
+    """Get persisted selector hit counts"""
+    return selector_stats.get_status()
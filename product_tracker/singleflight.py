@@ -0,0 +1,99 @@
+"""
+Single-flight coalescing of concurrent scrapes
+
+When several callers ask for the same product while a scrape for it is
+already running (overlapping cron jobs for different watchers, a /form
+submission, a debug trigger), they wait for that one scrape and share its
+result instead of each launching their own fetch.
+
+A waiting caller still honours its own job deadline. If the leader ran
+out of its deadline, the waiters that have time left try again, and one
+of them leads the next scrape.
+"""
+
+import threading
+import logging
+
+from product_tracker.admission import DeadlineExceeded, time_left
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        # Counters for the debug pages
+        self.executions = 0
+        self.coalesced = 0
+        self.retried = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Every caller gets the same return value, or the same exception,
+        except the leader's DeadlineExceeded, after which waiters retry.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    call.waiters += 1
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.executions += 1
+                    leader = True
+
+            if not leader:
+                logger.info(f"🔁 Joining in-flight scrape for {key}")
+                left = time_left()
+                if not call.done.wait(None if left is None else max(0.0, left)):
+                    raise DeadlineExceeded(f"Deadline passed waiting for the in-flight scrape of {key}")
+                if isinstance(call.error, DeadlineExceeded):
+                    # The leader's deadline, not ours
+                    with self._lock:
+                        self.retried += 1
+                    continue
+            else:
+                try:
+                    call.result = fn(*args, **kwargs)
+                except Exception as e:
+                    call.error = e
+                finally:
+                    with self._lock:
+                        self._calls.pop(key, None)
+                    call.done.set()
+
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'in_flight': {key: call.waiters for key, call in self._calls.items()},
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'retried': self.retried,
+            }
+
+
+# Global single-flight table for product scrapes
+scrape_flight = SingleFlight()
+
+
+def get_single_flight_status():
+    """Get in-flight scrapes and coalescing counters"""
+    return scrape_flight.get_status()
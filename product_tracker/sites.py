@@ -0,0 +1,182 @@
+"""
+Site adapter registry for the scraping pipeline
+
+Each supported site declares which fetch tiers to try (in order) and how to
+extract price and coupon from a fetched page. scrape_price_and_coupons walks
+the tiers, fetching each URL at most once per tier and sharing that document
+between the price and coupon extractors.
+"""
+
+import re
+
+from product_tracker.identity import product_id
+from product_tracker.escalation import escalation_policy
+from product_tracker.fetchers import TIER_HTTP, TIER_BROWSER
+from product_tracker.parsing import TagFilter, tag_classes
+from product_tracker.amazon import extract_amazon_page_price, AMAZON_PRICE_PROBES
+from product_tracker.myntra import (
+    extract_myntra_price,
+    parse_myntra_offer_page,
+    MYNTRA_OFFER_PROBES,
+    extract_myntra_state,
+    parse_myntra_state,
+)
+
+# Fetch strategies
+STRATEGY_HTTP = (TIER_HTTP,)
+STRATEGY_BROWSER = (TIER_BROWSER,)
+STRATEGY_HTTP_THEN_BROWSER = (TIER_HTTP, TIER_BROWSER)
+
+
+class SiteAdapter:
+    """Fetch strategy and extractors for one site.
+
+    Extractors take a FetchedPage and return None when the page does not
+    contain what they look for, which lets the pipeline escalate to the next
+    tier. A coupon extractor returns an empty dict when the page shows the
+    product has no coupon, so no further tier is tried.
+
+    browser_probes ({name: {group, selectors, html}}) are evaluated in the
+    live page in a single round trip on the browser tier; results are on
+    page.probes.
+
+    parse_only is a TagFilter limiting page.soup to the tags the extractors
+    read. stop_markers are byte regexes found in order in the HTTP body;
+    once all have been seen the rest of the body is not read. Both must
+    cover everything the extractors look at, or a field goes missing.
+    """
+
+    def __init__(self, name, markers, strategy, price_extractor=None, coupon_extractor=None,
+                 browser_probes=None, parse_only=None, stop_markers=()):
+        self.name = name
+        self.markers = tuple(markers)
+        self.strategy = tuple(strategy)
+        self.price_extractor = price_extractor
+        self.coupon_extractor = coupon_extractor
+        self.browser_probes = dict(browser_probes or {})
+        self.parse_only = parse_only
+        self.stop_markers = tuple(stop_markers)
+
+    def matches(self, url):
+        return any(marker in url for marker in self.markers)
+
+    def extract_price(self, page):
+        if self.price_extractor is None:
+            return None
+        return self.price_extractor(page)
+
+    def extract_coupon(self, page):
+        if self.coupon_extractor is None:
+            return None
+        return self.coupon_extractor(page)
+
+    def __repr__(self):
+        return f"SiteAdapter({self.name!r}, strategy={self.strategy})"
+
+
+_ADAPTERS = []
+
+# Used for any URL no registered adapter matches
+GENERIC_ADAPTER = SiteAdapter('generic', [], STRATEGY_HTTP)
+
+
+def register_site(adapter):
+    """Register a site adapter; later registrations take precedence"""
+    _ADAPTERS.insert(0, adapter)
+    return adapter
+
+
+def get_site_adapter(url):
+    """Return the adapter responsible for a URL"""
+    for adapter in _ADAPTERS:
+        if adapter.matches(url):
+            return adapter
+    return GENERIC_ADAPTER
+
+
+def get_registered_sites():
+    """Get a summary of registered adapters for debug pages"""
+    return [
+        {'name': adapter.name, 'markers': list(adapter.markers), 'strategy': list(adapter.strategy)}
+        for adapter in _ADAPTERS
+    ]
+
+
+def _amazon_tags(name, attrs):
+    """Title and the price spans AMAZON_PRICE_SELECTORS look at"""
+    if name == 'title':
+        return True
+    if name != 'span':
+        return False
+    classes = tag_classes(attrs)
+    return (attrs.get('id') or '').startswith('priceblock_') or 'a-price' in classes or 'a-price-whole' in classes
+
+
+# Static Amazon HTML often already carries the price; the escalation
+# policy learns when it does not and goes straight to the browser
+register_site(SiteAdapter(
+    'amazon',
+    ['amazon.'],
+    STRATEGY_HTTP_THEN_BROWSER,
+    price_extractor=extract_amazon_page_price,
+    browser_probes=AMAZON_PRICE_PROBES,
+    parse_only=TagFilter(_amazon_tags),
+    # The buy box price sits right after one of these containers
+    stop_markers=[re.compile(rb'id="(?:priceblock_\w+|corePriceDisplay_desktop_feature_div|apex_desktop)"')],
+))
+
+
+def _myntra_state(page):
+    """Parsed window.__myx state for a page, or None; computed once per page"""
+    if 'myntra_state' not in page.memo:
+        state = extract_myntra_state(page.html)
+        page.memo['myntra_state'] = parse_myntra_state(state) if state else None
+    return page.memo['myntra_state']
+
+
+def _myntra_price(page):
+    state = _myntra_state(page)
+    if state and state['price'] is not None:
+        return state['price']
+    return extract_myntra_price(page.soup)
+
+
+def _myntra_coupon(page):
+    state = _myntra_state(page)
+    if state and state['coupon'] is not None:
+        return state['coupon']
+    # The offer block is rendered client-side, so only a browser page can
+    # prove there is no coupon; once it has, trust that for a while
+    pid = product_id(page.url)
+    if page.tier == TIER_BROWSER:
+        coupon = parse_myntra_offer_page(page)
+        escalation_policy.record_coupon_check(pid, bool(coupon))
+        return coupon
+    if state and escalation_policy.coupon_recently_absent(pid):
+        return {}
+    return None
+
+
+def _myntra_tags(name, attrs):
+    """Title, description meta, the price span and the offer block"""
+    if name == 'title':
+        return True
+    if name == 'meta':
+        return attrs.get('name') == 'description'
+    classes = tag_classes(attrs)
+    return (name == 'span' and 'pdp-price' in classes) or (name == 'div' and 'pdp-offers-offer' in classes)
+
+
+# Myntra ships price and offers as embedded JSON state in the initial
+# HTML; the browser is only needed when that state is missing
+register_site(SiteAdapter(
+    'myntra',
+    ['myntra.'],
+    STRATEGY_HTTP_THEN_BROWSER,
+    price_extractor=_myntra_price,
+    coupon_extractor=_myntra_coupon,
+    browser_probes=MYNTRA_OFFER_PROBES,
+    parse_only=TagFilter(_myntra_tags),
+    # Everything after the embedded state script is recommendations and bundles
+    stop_markers=[re.compile(rb'window\.__myx\s*='), re.compile(rb'</script>')],
+))
@@ -0,0 +1,155 @@
+"""
+Structured-data price extraction
+
+Cheap, targeted lookups for the price a page declares about itself:
+JSON-LD Product/Offer blocks, og:/product: price meta tags and microdata
+itemprop="price". These are tried before scanning the whole page text,
+which is slower and easily picks up EMI amounts or recommendation prices.
+"""
+
+import re
+import json
+import threading
+
+_NUMBER_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+_META_PRICE_NAMES = ('product:price:amount', 'og:price:amount')
+_META_CURRENCY_NAMES = ('product:price:currency', 'og:price:currency')
+
+# Tier names, in the order they are tried
+TIER_JSON_LD = 'json-ld'
+TIER_META = 'meta'
+TIER_MICRODATA = 'microdata'
+TIER_TEXT = 'text'
+
+_tier_counts = {}
+_tier_lock = threading.Lock()
+
+
+def record_tier(tier):
+    with _tier_lock:
+        _tier_counts[tier] = _tier_counts.get(tier, 0) + 1
+
+
+def get_price_tier_stats():
+    """How often each extraction tier produced the price"""
+    with _tier_lock:
+        return dict(_tier_counts)
+
+
+def parse_price(value):
+    """Turn '₹1,299.00', 'Rs. 1299' or 1299 into 1299.0; None if no number"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    match = _NUMBER_RE.search(str(value))
+    if not match:
+        return None
+    try:
+        price = float(match.group(0).replace(',', ''))
+    except ValueError:
+        return None
+    return price if price > 0 else None
+
+
+def _is_rupee(currency):
+    return not currency or str(currency).strip().upper() in ('INR', '₹', 'RS', 'RS.')
+
+
+def _iter_json_ld_nodes(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _iter_json_ld_nodes(data['@graph'])
+
+
+def _types(node):
+    node_type = node.get('@type', [])
+    return set(node_type if isinstance(node_type, list) else [node_type])
+
+
+def _offer_price(offer):
+    if isinstance(offer, list):
+        for item in offer:
+            price = _offer_price(item)
+            if price is not None:
+                return price
+        return None
+    if not isinstance(offer, dict) or not _is_rupee(offer.get('priceCurrency')):
+        return None
+    for key in ('price', 'lowPrice'):
+        price = parse_price(offer.get(key))
+        if price is not None:
+            return price
+    spec = offer.get('priceSpecification')
+    if spec:
+        return _offer_price(spec)
+    return None
+
+
+def extract_json_ld_price(soup):
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        for node in _iter_json_ld_nodes(data):
+            types = _types(node)
+            if 'Product' in types or 'ProductGroup' in types:
+                price = _offer_price(node.get('offers'))
+            elif types & {'Offer', 'AggregateOffer'}:
+                price = _offer_price(node)
+            else:
+                continue
+            if price is not None:
+                return price
+    return None
+
+
+def extract_meta_price(soup):
+    currency = None
+    for name in _META_CURRENCY_NAMES:
+        tag = soup.find('meta', attrs={'property': name})
+        if tag and tag.get('content'):
+            currency = tag['content']
+            break
+    if not _is_rupee(currency):
+        return None
+    for name in _META_PRICE_NAMES:
+        tag = soup.find('meta', attrs={'property': name})
+        if tag:
+            price = parse_price(tag.get('content'))
+            if price is not None:
+                return price
+    return None
+
+
+def extract_microdata_price(soup):
+    currency_tag = soup.find(attrs={'itemprop': 'priceCurrency'})
+    if currency_tag and not _is_rupee(currency_tag.get('content') or currency_tag.get_text(strip=True)):
+        return None
+    for tag in soup.find_all(attrs={'itemprop': 'price'}):
+        price = parse_price(tag.get('content') or tag.get_text(strip=True))
+        if price is not None:
+            return price
+    return None
+
+
+_STRUCTURED_TIERS = (
+    (TIER_JSON_LD, extract_json_ld_price),
+    (TIER_META, extract_meta_price),
+    (TIER_MICRODATA, extract_microdata_price),
+)
+
+
+def extract_structured_price(soup):
+    """Return (price, tier) from the first structured source that has one, else (None, None)"""
+    for tier, extractor in _STRUCTURED_TIERS:
+        price = extractor(soup)
+        if price is not None:
+            return price, tier
+    return None, None
@@ -1,25 +1,45 @@
+import time
+
 from .scheduler import (
     schedule_product_tracking,
     delete_scheduled,
     scheduled_products
 )
-from bs4 import BeautifulSoup
-import requests
-
-from .config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, ALIAS_TO_ID, ID_TO_ALIAS
+from .config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, ALIAS_TO_ID, ID_TO_ALIAS, CHECK_ALTERNATE_SITES, TARGETED_PARSING, RATE_LIMIT_MAX_WAIT
 
 from .notifier import send_telegram_message
-from .amazon import get_amazon_price_selenium
-from .myntra import extract_myntra_price, extract_myntra_coupon
+from .fetchers import fetch_page, fetch_http, TIER_HTTP
+from .response_cache import response_cache
+from .singleflight import scrape_flight
+from .identity import product_id
+from .urls import get_domain
+from .escalation import escalation_policy, detect_bot_wall
+from .profiles import profile_store
+from .ratelimit import domain_guard, is_site_failure
+from .admission import admission, bounded
+from .structured import extract_structured_price, record_tier, TIER_TEXT
+from .sites import get_site_adapter
+from .compare import compare_alternate_sites
+from .adaptive import record_price
 
-def track_product(product_url, target_price, notify_method, phone_or_chat):
+def track_product(product_url, target_price, notify_method, phone_or_chat, scraped=None, alternates=None):
     print(f"[track_product] Called with: product_url={product_url}, target_price={target_price}, notify_method={notify_method}, phone_or_chat={phone_or_chat}")
-    # Scrape the main product page
-    price, title, coupon = scrape_price_and_coupons(product_url)
+    # Scrape the main product page, unless a batch run already did
+    if scraped is None:
+        scraped = scrape_price_and_coupons(product_url)
+    price, title, coupon = scraped
+    record_price(product_url, price)
     best_price = price
     best_url = product_url
     best_coupon = coupon
 
+    # Same product on the alternate sites; batch runs look these up alongside the scrape.
+    # A search match can be an accessory or another variant, so alternates are only
+    # reported; the target decision stays on the tracked product's own price.
+    if alternates is None:
+        alternates = find_alternate_prices(product_url, title)
+    alt_line = _alternates_line(alternates, price)
+
     # Convert aliases to chat IDs if needed
     chat_ids = []
     for entry in (phone_or_chat if isinstance(phone_or_chat, list) else [phone_or_chat]):
@@ -34,14 +54,14 @@ def track_product(product_url, target_price, notify_method, phone_or_chat):
     if best_price and best_price <= target_price:
         message = (
             f"<b>🟢 Target Price Triggered!</b> <b>{title}</b>\n"
-            f"<b>Price:</b> {best_price}\n<b>Target Price:</b> {target_price}\n"
+            f"<b>Price:</b> {best_price}\n{alt_line}<b>Target Price:</b> {target_price}\n"
             f"<b>Coupon:</b> {best_coupon}\n"
             f"<a href='{best_url}'>Product Link</a>"
         )
     else:
         message = (
             f"<b>🔴 Target Price Not Triggered Still!</b> <b>{title}</b>\n"
-            f"<b>Price:</b> {best_price}\n<b>Target Price:</b> {target_price}\n"
+            f"<b>Price:</b> {best_price}\n{alt_line}<b>Target Price:</b> {target_price}\n"
             f"<b>Coupon:</b> {best_coupon}\n"
             f"<a href='{best_url}'>Product Link</a>"
         )
@@ -51,8 +71,8 @@ def track_product(product_url, target_price, notify_method, phone_or_chat):
             send_telegram_message(message, chat_id, parse_mode='HTML')
 
     # BLINKDEAL logic for Myntra
-    if 'myntra.' in product_url and best_coupon:
-        if isinstance(best_coupon, dict) and best_coupon.get('coupon_code') and 'BLINKDEAL' in best_coupon.get('coupon_code', '').upper():
+    if 'myntra.' in product_url and coupon:
+        if isinstance(coupon, dict) and coupon.get('coupon_code') and 'BLINKDEAL' in coupon.get('coupon_code', '').upper():
             blink_msg = 'BLINK DEAL is active'
             for chat_id in ['249722033', '258922383']:
                 send_telegram_message(blink_msg, chat_id, parse_mode='HTML')
@@ -72,34 +92,145 @@ def track_product(product_url, target_price, notify_method, phone_or_chat):
 
 
 
+def _alternates_line(alternates, price):
+    """Message line listing alternate sites that look cheaper than the tracked product"""
+    cheaper = sorted(
+        (alt for alt in alternates if alt['price'] is not None and (price is None or alt['price'] < price)),
+        key=lambda alt: alt['price'],
+    )
+    if not cheaper:
+        return ""
+    links = ", ".join(f"<a href='{alt['url']}'>{alt['site']}</a> {alt['price']}" for alt in cheaper)
+    return f"<b>Elsewhere (unverified match):</b> {links}\n"
+
+
+def find_alternate_prices(product_url, title):
+    """Prices for the same product on ALTERNATE_SITES; never raises"""
+    if not CHECK_ALTERNATE_SITES:
+        return []
+    try:
+        # 'Product' is the placeholder for a page without a title; nothing to search for
+        return compare_alternate_sites(product_url, None if title == 'Product' else title)
+    except Exception as e:
+        print(f"[find_alternate_prices] Comparison failed: {e}")
+        return []
+
+
 def scrape_price_and_coupons(url):
     print(f"[scrape_price_and_coupons] Called with: url={url}")
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    resp = requests.get(url, headers=headers)
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    title = soup.title.string if soup.title else 'Product'
+    # Concurrent callers for the same product share one scrape
+    return scrape_flight.do(product_id(url), _scrape_price_and_coupons, url)
+
+
+def _scrape_price_and_coupons(url):
+    adapter = get_site_adapter(url)
+    domain = get_domain(url)
     price = None
+    title = None
     coupon = None
+    fetched_any = False
+    last_error = None
 
-    # Amazon-specific logic
-    if 'amazon.' in url:
-        price = get_amazon_price_selenium(url)
-        if price is not None:
-            print(f"[scrape_price_and_coupons] Returning: price={price}, title={title}, coupon=None")
-            return price, title, None
+    # Walk the adapter's tiers cheapest first; each tier fetches the URL once
+    # and the page is shared by the price and coupon extractors. Tiers that
+    # rarely work for this domain are skipped (never the last one).
+    for i, tier in enumerate(adapter.strategy):
+        last_tier = i == len(adapter.strategy) - 1
+        if not last_tier and escalation_policy.should_skip(domain, tier):
+            print(f"[scrape_price_and_coupons] Skipping {tier} tier for {domain} (low success rate)")
+            continue
+        # Queues for a browser or HTTP slot first; waiting there is capacity, not the site, so it is not
+        # recorded, and no half-open breaker trial is taken until the fetch can actually start
+        with admission.admit(tier):
+            # Then for the domain's rate limit (no longer than the job has left); raises while its breaker is open
+            domain_guard.acquire(domain, max_wait=bounded(RATE_LIMIT_MAX_WAIT, f"{tier} fetch"))
+            started = time.monotonic()
+            try:
+                fields = _fetch_and_extract(url, tier, adapter, last_tier)
+            except Exception as e:
+                print(f"[scrape_price_and_coupons] {tier} fetch failed: {e}")
+                elapsed = time.monotonic() - started
+                if is_site_failure(e):
+                    escalation_policy.record(domain, tier, False, elapsed)
+                    profile_store.record(url, False, elapsed)
+                    domain_guard.record(domain, False, f"{tier}: {type(e).__name__}")
+                else:
+                    # Nothing was learned about the site; free a half-open trial for the next caller
+                    domain_guard.release(domain)
+                last_error = e
+                continue
+            elapsed = time.monotonic() - started
+        blocked = fields.get('blocked', False)
+        error_status = fields.get('error_status')
+        escalation_policy.record(domain, tier, fields['price'] is not None, elapsed)
+        profile_store.record(url, fields['price'] is not None, elapsed, blocked=blocked)
+        # Bot walls and error responses (5xx left over after retries, 404...) count against the domain
+        if blocked:
+            domain_guard.record(domain, False, f"{tier}: bot wall")
+        elif error_status:
+            domain_guard.record(domain, False, f"{tier}: HTTP {error_status}")
+        else:
+            domain_guard.record(domain, True)
+        fetched_any = True
+        title = title or fields['title']
+        if price is None:
+            price = fields['price']
+        if coupon is None:
+            coupon = fields['coupon']
+        if price is not None and (coupon is not None or not adapter.coupon_extractor):
+            break
+
+    if not fetched_any:
+        raise last_error
+
+    title = title or 'Product'
+    print(f"[scrape_price_and_coupons] Returning: price={price}, title={title}, coupon={coupon}")
+    return price, title, coupon
+
+
+# Nothing usable on a captcha / robot-check page
+_BLOCKED_FIELDS = {'title': None, 'price': None, 'coupon': None, 'blocked': True}
 
-    # Myntra-specific logic
-    if 'myntra.' in url:
-        price = extract_myntra_price(soup)
-        if price is not None:
-            coupon = extract_myntra_coupon(url)
-            print(f"[scrape_price_and_coupons] Returning: price={price}, title={title}, coupon={coupon}")
-            return price, title, coupon
 
-    # Generic logic: look for ₹ or Rs in visible text
-    price = extract_generic_rupee_price(soup)
-    print(f"[scrape_price_and_coupons] Returning: price={price}, title={title}, coupon=None")
-    return price, title, None
+def _extract_fields(adapter, page, last_tier):
+    fields = {
+        'title': page.title,
+        'price': adapter.extract_price(page),
+        'coupon': adapter.extract_coupon(page),
+    }
+    # Generic logic: look for ₹ or Rs in visible text (needs the whole page)
+    if fields['price'] is None and last_tier:
+        fields['price'] = extract_generic_rupee_price(page.full_soup)
+    return fields
+
+
+def _fetch_and_extract(url, tier, adapter, last_tier):
+    parse_only = adapter.parse_only if TARGETED_PARSING else None
+    if tier != TIER_HTTP:
+        page = fetch_page(url, tier, probes=adapter.browser_probes, parse_only=parse_only)
+        if detect_bot_wall(page):
+            print(f"[scrape_price_and_coupons] Bot wall detected on {tier} tier")
+            return dict(_BLOCKED_FIELDS)
+        return _extract_fields(adapter, page, last_tier)
+
+    # Plain HTTP pages are revalidated against the response cache; an
+    # unchanged page reuses the previously extracted fields without parsing
+    entry = response_cache.get(url)
+    page = fetch_http(url, headers=response_cache.conditional_headers(entry),
+                      stop_markers=adapter.stop_markers if TARGETED_PARSING else None, parse_only=parse_only)
+    cached = response_cache.lookup(entry, page.status_code, page.content)
+    if cached is not None:
+        print(f"[scrape_price_and_coupons] Response cache hit (status={page.status_code})")
+        return cached
+    if detect_bot_wall(page):
+        print(f"[scrape_price_and_coupons] Bot wall detected on {tier} tier")
+        return dict(_BLOCKED_FIELDS)
+    fields = _extract_fields(adapter, page, last_tier)
+    if page.status_code == 200:
+        response_cache.store(url, page.headers, page.content, fields)
+    else:
+        fields['error_status'] = page.status_code
+    return fields
 
 
 
@@ -107,13 +238,20 @@ def scrape_price_and_coupons(url):
 def extract_generic_rupee_price(soup):
     print(f"[extract_generic_rupee_price] Called with: soup=<BeautifulSoup object>")
     import re
+    # Cheap structured sources first: JSON-LD offers, price meta tags, microdata
+    price, tier = extract_structured_price(soup)
+    if price is not None:
+        record_tier(tier)
+        print(f"[extract_generic_rupee_price] Returning: {price} (tier={tier})")
+        return price
     # Look for ₹ or Rs followed by numbers in visible text
     text = soup.get_text(separator=' ', strip=True)
     match = re.search(r'(?:₹|Rs\.?)[ ]*([\d,]+)', text)
     if match:
         try:
             result = float(match.group(1).replace(',', ''))
-            print(f"[extract_generic_rupee_price] Returning: {result}")
+            record_tier(TIER_TEXT)
+            print(f"[extract_generic_rupee_price] Returning: {result} (tier={TIER_TEXT})")
             return result
         except Exception:
             print(f"[extract_generic_rupee_price] Returning: None (exception)")
@@ -0,0 +1,14 @@
+"""
+URL helpers shared by the scraping modules
+"""
+
+from urllib.parse import urlparse
+
+
+def get_domain(url):
+    """Return the bare host of a URL, e.g. 'amazon.in' for 'https://www.amazon.in/dp/X'"""
+    host = (urlparse(url).hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
@@ -0,0 +1,7 @@
+"""
+Shared test setup: no MongoDB, so the database falls back to its JSON file at once
+"""
+
+import os
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=10')
@@ -0,0 +1,73 @@
+"""
+Adaptive polling intervals and stretching a plan to fit the daily budget
+"""
+
+import pytest
+
+from product_tracker.adaptive import PriceHistory, AdaptivePlanner
+
+DAY = 86400
+NOW = 1_800_000_000.0
+
+
+def _runs_per_day(item, interval):
+    return 24 // interval
+
+
+def _item(pid, interval=1, target=100):
+    return {'product_url': f"https://shop.example.in/{pid}", 'product_id': pid,
+            'schedule_interval': interval, 'target_price': target}
+
+
+@pytest.fixture
+def history():
+    history = PriceHistory(path=None)
+    # Near its target, static for three weeks, and changing every few hours
+    history.record('near', 104, now=NOW - DAY)
+    history.record('static', 500, now=NOW - 21 * DAY)
+    history.record('static', 500, now=NOW - DAY)
+    for hours, price in ((60, 300), (30, 280), (2, 310)):
+        history.record('volatile', price, now=NOW - hours * 3600)
+    return history
+
+
+def test_assess(history):
+    planner = AdaptivePlanner(history, budget=0)
+    assert planner.assess('near', 100, 4, NOW)[:2] == (2, ['near target'])
+    assert planner.assess('static', 100, 4, NOW)[:2] == (24, ['static 21d'])
+    assert planner.assess('volatile', 100, 4, NOW)[:2] == (2, ['volatile (2 changes)'])
+    assert planner.assess('unknown', 100, 5, NOW)[:2] == (6, ['no history'])
+
+
+def test_plan_within_budget_keeps_assessed_intervals(history):
+    planner = AdaptivePlanner(history, budget=0)
+    plan = planner.plan([_item('near', 2), _item('static', 2), _item('volatile', 2)], _runs_per_day, now=NOW)
+    assert plan == {'near': 1, 'static': 8, 'volatile': 1}
+
+
+def test_plan_over_budget_stretches_least_interesting_first(history):
+    products = [_item('near'), _item('static'), _item('volatile')]
+    planner = AdaptivePlanner(history, budget=40)
+    plan = planner.plan(products, _runs_per_day, now=NOW)
+
+    status = planner.get_status()
+    assert status['adaptive_checks_per_day'] <= 40
+    assert not status['over_budget']
+    # The near-target product keeps hourly checks; static and volatile ones give way
+    assert plan['near'] == 1
+    assert plan['static'] >= plan['volatile'] > 1
+    assert 'budget' in status['intervals']['volatile']['reasons']
+    assert 'budget' not in status['intervals']['near']['reasons']
+
+
+def test_plan_that_cannot_fit_reports_over_budget(history):
+    planner = AdaptivePlanner(history, budget=1)
+    plan = planner.plan([_item('near'), _item('static'), _item('volatile')], _runs_per_day, now=NOW)
+    assert set(plan.values()) == {24}
+    assert planner.get_status()['over_budget']
+
+
+def test_schedules_of_one_product_share_the_most_frequent_interval(history):
+    planner = AdaptivePlanner(history, budget=0)
+    plan = planner.plan([_item('static', 24), _item('static', 2)], _runs_per_day, now=NOW)
+    assert plan == {'static': 8}
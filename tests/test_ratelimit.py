@@ -0,0 +1,104 @@
+"""
+Token bucket waits and circuit breaker state transitions
+"""
+
+import pytest
+
+from product_tracker.ratelimit import (
+    TokenBucket,
+    CircuitBreaker,
+    DomainGuard,
+    CircuitOpenError,
+    RateLimitExceeded,
+    STATE_CLOSED,
+    STATE_OPEN,
+    STATE_HALF_OPEN,
+)
+
+
+def _expire(breaker):
+    breaker.open_until = 0.0
+
+
+def test_bucket_serves_burst_then_queues_up_to_max_wait():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    assert bucket.reserve(max_wait=5) == 0.0
+    assert bucket.reserve(max_wait=5) == 0.0
+    # Each queued caller reserves the next free second
+    assert bucket.reserve(max_wait=5) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(max_wait=5) == pytest.approx(2.0, abs=0.05)
+    assert bucket.reserve(max_wait=1.5) is None
+
+
+def test_breaker_opens_after_threshold_consecutive_failures():
+    breaker = CircuitBreaker(threshold=3, cooldown=60, max_cooldown=240)
+    breaker.record_failure('a')
+    breaker.record_failure('b')
+    breaker.record_success()
+    breaker.record_failure('c')
+    breaker.record_failure('d')
+    assert breaker.state == STATE_CLOSED
+    assert breaker.record_failure('e') is True
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+    assert breaker.short_circuited == 1
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(threshold=1, cooldown=60, max_cooldown=240)
+    breaker.record_failure('down')
+    _expire(breaker)
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_failed_trial_reopens_with_doubled_cooldown_up_to_the_cap():
+    breaker = CircuitBreaker(threshold=1, cooldown=60, max_cooldown=200)
+    breaker.record_failure('down')
+    for expected in (120, 200, 200):
+        _expire(breaker)
+        assert breaker.allow()
+        assert breaker.record_failure('still down') is True
+        assert breaker.state == STATE_OPEN
+        assert breaker.cooldown == expected
+        assert 0 < breaker.retry_in() <= expected
+
+
+def test_successful_trial_closes_and_resets_cooldown():
+    breaker = CircuitBreaker(threshold=1, cooldown=60, max_cooldown=240)
+    breaker.record_failure('down')
+    _expire(breaker)
+    breaker.allow()
+    breaker.record_failure('still down')
+    _expire(breaker)
+    breaker.allow()
+    assert breaker.record_success() is True
+    assert breaker.state == STATE_CLOSED
+    assert breaker.cooldown == 60
+    assert breaker.failures == 0
+
+
+def test_guard_raises_while_open_and_releases_unused_trials():
+    guard = DomainGuard(rate_per_minute=0, threshold=1, cooldown=60, max_cooldown=60)
+    guard.record('shop.test', False, 'HTTP 502')
+    with pytest.raises(CircuitOpenError):
+        guard.acquire('shop.test')
+
+    guard._breaker('shop.test').open_until = 0.0
+    guard.acquire('shop.test')
+    with pytest.raises(CircuitOpenError):
+        guard.acquire('shop.test')
+    guard.release('shop.test')
+    guard.acquire('shop.test')
+    assert guard._breaker('shop.test').state == STATE_HALF_OPEN
+
+
+def test_guard_frees_the_trial_when_the_rate_limit_queue_is_too_long():
+    guard = DomainGuard(rate_per_minute=1, burst=1, max_wait=5, threshold=1, cooldown=60, max_cooldown=60)
+    guard.acquire('shop.test')
+    guard.record('shop.test', False, 'HTTP 502')
+    guard._breaker('shop.test').open_until = 0.0
+    with pytest.raises(RateLimitExceeded):
+        guard.acquire('shop.test')
+    assert not guard._breaker('shop.test').trial_in_flight
@@ -0,0 +1,134 @@
+"""
+Job reconciliation, restore after downtime and missed-run catch-up selection
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import product_tracker.scheduler as scheduler
+from product_tracker.identity import product_id
+
+NOW = scheduler.IST.localize(datetime(2026, 3, 10, 12, 7))
+
+
+def _item(url, start_time='08:00', interval=4):
+    return {
+        'product_url': url,
+        'product_id': product_id(url),
+        'target_price': 100,
+        'telegram_chat_ids': ['1'],
+        'schedule_interval': interval,
+        'start_time': start_time,
+    }
+
+
+SHOES = 'https://www.myntra.com/shoes/puma/11111111/buy'
+KETTLE = 'https://www.amazon.in/dp/B000KETTLE'
+
+
+@pytest.fixture
+def products(monkeypatch):
+    products = []
+    monkeypatch.setattr(scheduler, 'scheduled_products', products)
+    monkeypatch.setattr(scheduler, '_job_specs', {})
+    monkeypatch.setattr(scheduler, '_reconcile_stats', scheduler._ReconcileStats())
+    monkeypatch.setattr(scheduler, 'SCHEDULER_MODE', 'cron')
+    monkeypatch.setattr(scheduler, 'ADAPTIVE_POLLING', False)
+    return products
+
+
+@pytest.fixture
+def sched(monkeypatch, products):
+    """A paused in-memory scheduler, so jobs get run times but never fire"""
+    sched = BackgroundScheduler(timezone=scheduler.IST)
+    sched.start(paused=True)
+    monkeypatch.setattr(scheduler, '_scheduler', sched)
+    yield sched
+    sched.shutdown(wait=False)
+
+
+def _last_reconcile():
+    reconcile = scheduler._reconcile_stats.get_status()['recent_reconciles'][-1]
+    return reconcile['added'], reconcile['updated'], reconcile['removed']
+
+
+def test_job_keys_number_repeated_products(products):
+    shoes = _item(SHOES)
+    keys = scheduler._job_keys([shoes, _item(KETTLE), dict(shoes, start_time='20:00')])
+    assert keys == [f"product_{shoes['product_id']}", f"product_{product_id(KETTLE)}", f"product_{shoes['product_id']}_2"]
+
+
+def test_reconcile_touches_only_changed_jobs(sched, products):
+    products.extend([_item(SHOES), _item(KETTLE), _item(SHOES, start_time='20:00')])
+    scheduler.reconcile_jobs()
+    assert _last_reconcile() == (3, 0, 0)
+    assert len(sched.get_jobs()) == 3
+
+    run_times = {job.id: job.next_run_time for job in sched.get_jobs()}
+    scheduler.reconcile_jobs()
+    assert _last_reconcile() == (0, 0, 0)
+    assert {job.id: job.next_run_time for job in sched.get_jobs()} == run_times
+
+    products[1]['start_time'] = '09:30'
+    scheduler.reconcile_jobs()
+    assert _last_reconcile() == (0, 1, 0)
+    assert scheduler._job_specs[f"product_{product_id(KETTLE)}"]['minute'] == 30
+
+
+def test_removing_first_duplicate_shifts_its_key(sched, products):
+    products.extend([_item(SHOES), _item(SHOES, start_time='20:30')])
+    scheduler.reconcile_jobs()
+    pid = products[0]['product_id']
+
+    products.pop(0)
+    scheduler.reconcile_jobs()
+    # The remaining schedule takes over the plain key with its own minute; the suffixed job goes
+    assert _last_reconcile() == (0, 1, 1)
+    assert [job.id for job in sched.get_jobs()] == [f"product_{pid}"]
+    assert scheduler._job_specs[f"product_{pid}"]['minute'] == 30
+
+
+def test_reconcile_without_scheduler_is_a_no_op(products, monkeypatch):
+    monkeypatch.setattr(scheduler, '_scheduler', None)
+    products.append(_item(SHOES))
+    scheduler.reconcile_jobs()
+    assert scheduler._job_specs == {}
+
+
+def test_restore_reports_overdue_jobs_and_moves_them_past_now(sched, products):
+    products.extend([_item(SHOES), _item(KETTLE)])
+    scheduler.reconcile_jobs()
+    scheduler._job_specs.clear()
+    shoes_key, kettle_key = scheduler._job_keys(products)
+    overdue = NOW - timedelta(hours=3)
+    sched.get_job(shoes_key).modify(next_run_time=overdue)
+    sched.get_job(kettle_key).modify(next_run_time=NOW + timedelta(hours=1))
+
+    missed = scheduler._restore_jobs(NOW)
+
+    assert missed == [(overdue, products[0])]
+    assert sched.get_job(shoes_key).next_run_time > NOW
+    assert sched.get_job(kettle_key).next_run_time == NOW + timedelta(hours=1)
+    # Restored specs let the next reconcile leave both jobs alone
+    scheduler.reconcile_jobs()
+    assert _last_reconcile() == (0, 0, 0)
+
+
+def test_select_catch_up(monkeypatch):
+    monkeypatch.setattr(scheduler, 'CATCHUP_MAX_AGE_HOURS', 24)
+    monkeypatch.setattr(scheduler, 'CATCHUP_MAX_RUNS', 2)
+    shoes, kettle, lamp, stale = (_item(SHOES), _item(KETTLE), _item('https://shop.example.in/lamp'),
+                                  _item('https://shop.example.in/old'))
+    missed = [
+        (NOW - timedelta(hours=1), lamp),
+        (NOW - timedelta(hours=2), shoes),
+        (NOW - timedelta(hours=5), kettle),
+        (NOW - timedelta(hours=4), shoes),  # Same product missed twice: made up once
+        (NOW - timedelta(hours=30), stale),  # Too old to be worth making up
+    ]
+    assert scheduler._select_catch_up(missed, NOW) == [kettle, shoes]
+
+    monkeypatch.setattr(scheduler, 'CATCHUP_MAX_RUNS', 10)
+    assert scheduler._select_catch_up(missed, NOW) == [kettle, shoes, lamp]
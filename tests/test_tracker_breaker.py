@@ -0,0 +1,83 @@
+"""
+A half-open breaker's trial must not leak when the fetch never reaches the site
+"""
+
+import pytest
+
+import product_tracker.tracker as tracker
+from product_tracker.admission import AdmissionController, AdmissionTimeout
+from product_tracker.ratelimit import DomainGuard, STATE_HALF_OPEN, STATE_OPEN
+
+URL = 'https://shop.example.test/item/42'
+DOMAIN = 'shop.example.test'
+
+
+@pytest.fixture
+def guard(monkeypatch):
+    """Fresh guard whose breaker for DOMAIN is open with the cooldown already over"""
+    guard = DomainGuard(rate_per_minute=0, threshold=1, cooldown=60, max_cooldown=60)
+    guard.record(DOMAIN, False, 'earlier failure')
+    guard._breaker(DOMAIN).open_until = 0.0
+    monkeypatch.setattr(tracker, 'domain_guard', guard)
+    return guard
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    admission = AdmissionController({'http': 1, 'browser': 1}, max_wait=0.05)
+    monkeypatch.setattr(tracker, 'admission', admission)
+    return admission
+
+
+def test_admission_timeout_does_not_take_the_trial(guard, admission, monkeypatch):
+    monkeypatch.setattr(tracker, '_fetch_and_extract', lambda *args: pytest.fail('fetched without a slot'))
+    with admission.admit('http'), admission.admit('browser'):
+        with pytest.raises(AdmissionTimeout):
+            tracker._scrape_price_and_coupons(URL)
+
+    # The trial is still available to the next caller
+    guard.acquire(DOMAIN)
+    assert guard._breaker(DOMAIN).state == STATE_HALF_OPEN
+
+
+def test_local_error_releases_the_trial(guard, admission, monkeypatch):
+    def render_worker_down(*args):
+        raise RuntimeError('Render worker unavailable: EOFError')
+
+    monkeypatch.setattr(tracker, '_fetch_and_extract', render_worker_down)
+    with pytest.raises(RuntimeError):
+        tracker._scrape_price_and_coupons(URL)
+
+    breaker = guard._breaker(DOMAIN)
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.failures == 1
+    guard.acquire(DOMAIN)
+
+
+def test_site_error_reopens_the_breaker(guard, admission, monkeypatch):
+    import requests
+
+    def connection_refused(*args):
+        raise requests.ConnectionError('connection refused')
+
+    monkeypatch.setattr(tracker, '_fetch_and_extract', connection_refused)
+    with pytest.raises(requests.ConnectionError):
+        tracker._scrape_price_and_coupons(URL)
+
+    assert guard._breaker(DOMAIN).state == STATE_OPEN
+
+
+def test_server_error_response_counts_as_failure(guard, admission, monkeypatch):
+    from product_tracker.fetchers import FetchedPage, TIER_HTTP
+
+    def bad_gateway(url, **kwargs):
+        return FetchedPage(url, '<html><title>Bad Gateway</title></html>', TIER_HTTP, 502, {}, b'')
+
+    monkeypatch.setattr(tracker, 'fetch_http', bad_gateway)
+    monkeypatch.setattr(tracker.response_cache, 'get', lambda url: None)
+    monkeypatch.setattr(tracker, 'fetch_page', lambda *args, **kwargs: pytest.fail('escalated past an open breaker'))
+    tracker._scrape_price_and_coupons(URL)
+
+    breaker = guard._breaker(DOMAIN)
+    assert breaker.state == STATE_OPEN
+    assert breaker.last_failure == 'http: HTTP 502'